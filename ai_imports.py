@@ -0,0 +1,53 @@
+import os
+import logging
+import threading
+import importlib
+
+# LangChain, OpenAI and LIDA are the heaviest imports of the app and most sessions never
+# open the AI panel, so they are imported on first use instead of at startup.
+# prewarm() imports them in a background thread, started when the panel is opened
+# (or at startup with AI_PREWARM=1) so the first question does not wait for them.
+AI_PREWARM = int(os.getenv('AI_PREWARM', 0))
+
+AI_MODULES = [
+    "openai",
+    "langchain_openai",
+    "langchain.agents",
+    "langchain_experimental.agents.agent_toolkits",
+    "lida",
+]
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_prewarm_thread = None
+
+
+def _import_all():
+    for name in AI_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.warning(f"Prewarm import of {name} failed: {e}")
+
+
+def prewarm():
+    """Import the AI packages in a background thread, once per process."""
+    global _prewarm_thread
+    with _lock:
+        if _prewarm_thread is None:
+            _prewarm_thread = threading.Thread(target=_import_all, name="ai-prewarm", daemon=True)
+            _prewarm_thread.start()
+
+
+def agent_toolkit():
+    """
+    Import what chat_with_agent needs.
+
+    Returns:
+        Tuple (ChatOpenAI, create_pandas_dataframe_agent, AgentType).
+    """
+    from langchain_openai import ChatOpenAI
+    from langchain_experimental.agents.agent_toolkits import create_pandas_dataframe_agent
+    from langchain.agents.agent_types import AgentType
+    return ChatOpenAI, create_pandas_dataframe_agent, AgentType
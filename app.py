@@ -1,125 +1,55 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from streamlit_extras.stylable_container import stylable_container
 import pandas as pd
 import os
-import openai
-import time
 import logging
 import asyncio
 import json
 from dotenv import load_dotenv
 import httpx
 from fastapi import HTTPException, Response
-import requests
-import glob
-
-from langchain_openai import ChatOpenAI
-from langchain.agents import AgentExecutor
-from langchain_experimental.agents.agent_toolkits import create_csv_agent
-from langchain.agents.agent_types import AgentType
-
-
-from reports_type import (best_sellers, current_inventory, customer_details, low_stock_inventory,
-                          order_sales_summary, rep_details, reps_summary, sku_not_ordered,
-                          third_party_sales_summary, top_customers, inventory_depletion, reps_visits,product_fulfillment, payments)
 
 from side_func import identify_file, identify_file_mini
+import report_store
+import report_registry
+import report_io
+import upload_workspace
+from report_schema import EXPECTED_COLUMNS, read_report, check_sample
+from report_download import download_report, REPORT_MAX_AGE
+from report_convert import convert_in_pool
+import shared_cache
+import memory_governor
+import frame_compact
+import report_preprocess
+import order_index
+import http_client
+import table_view
+import ai_imports
 
-EXPECTED_COLUMNS = {
-    "PRODUCT_FULFILLMENT": [
-        "Order ID", "Customer", "Shipping Address", "Shipping City", "Shipping State",
-        "Shipping ZIP", "Delivery Status", "Type", "VIA", "Fulfilled By", "Tracking ID",
-        "Fulfill Date", "Product Name", "QTY", "Product Price", "Product Total",
-        "Payment Status", "Grand Total", "Paid", "Balance", "Contact Phone", "Contact Name"
-    ],
-    "REPS_VISITS": [
-        "Role", "ID", "Name", "Date", "Business Name", "Billing Address", "Billing City",
-        "Billing State", "Billing ZIP", "Shipping Address", "Shipping City", "Shipping State",
-        "Shipping ZIP", "Check In", "Check Out", "Total Time", "Check In Status",
-        "Cases Sold (Direct)", "Cases Sold (3rd party)", "Cases Sold Total", "Notes",
-        "Orders (Direct)", "Orders (3rd party)", "Orders Total", "Photos", "Forms Submission"
-    ],
-    "INVENTORY_DEPLETION": [
-        "Business Name", "Shipping Address", "Shipping City", "Shipping State",
-        "Shipping ZIP", "Billing Address", "Billing City", "Billing State", "Billing ZIP",
-        "Ginger Shots / Digestive Aid / 2 fl oz", "Ginger Shots / Immunity Aid / 2 fl oz",
-        "Ginger Shots / Immunity Booster / 2 fl oz", "Ginger Shots / Vitamin C / 2 fl oz"
-    ],
-    "REPS_SUMMARY": [
-        "ID", "Name", "Role", "Visits", "Orders (Direct)", "Orders (3rd party)",
-        "Orders Total", "Cases Sold (Direct)", "Cases Sold (3rd party)", "Cases Sold Total",
-        "Total Revenue (Direct)", "Total Revenue (3rd party)", "Total Revenue", "Photos",
-        "Notes", "New Clients", "Date", "Start Day", "End Day", "Break", "Travel Distance",
-        "First Visit", "Last Visit", "Total Time"
-    ],
-    "REP_DETAILS": [
-        "ID", "Name", "Role", "Email", "Phone Number", "Total Visits",
-        "Total Photos", "Total Notes", "Total Working Hours", "Total Break Hours",
-        "Total Travel Distance", "Assigned Customers", "Active Customers", "Inactive Customers"
-    ],
-    "SKU_NOT_ORDERED": [
-        "Category Name", "Product Name", "SKU", "Manufacturer Name", "Cases Sold",
-        "Total Revenue", "Wholesale Price", "Retail Price", "Available Cases (QTY)", 'On Hand Cases', 'Cost'
-    ],
-    "BEST_SELLERS": [
-        "Category Name", "Product Name", "SKU", "On Hand Cases", "Allocated Cases",
-        "Manufacturer Name", "Cases Sold", "Total Revenue", "Wholesale Price",
-        "Retail Price", "Available Cases (QTY)", 'Cost'
-    ],
-    "LOW_STOCK_INVENTORY": [
-        "Category Name", "Product Name", "SKU", "On Hand Cases", "Allocated Cases",
-        "Manufacturer Name", "Available Cases (QTY)", "Wholesale Price", "Retail Price",'Total Revenue', 'Cost'
-    ],
-    "CURRENT_INVENTORY": [
-        "Category Name", "Product Name", "SKU", "On Hand Cases", "Allocated Cases",
-        "Manufacturer Name", "Available Cases (QTY)", "Wholesale Price", "Retail Price", 'Total Revenue', 'Cost'
-    ],
-    "THIRD_PARTY_SALES_SUMMARY": [
-        "Customer ID", "Customer", "Billing Address", "Slotting", "Billing City",
-        "Billing State", "Billing ZIP", "Shipping Address", "Shipping City", "Shipping State",
-        "Shipping ZIP", "Order ID", "Created By", "Date Created", "Product Name",
-        "Manufacturer Name", "QTY", "Grand Total", "Discount Type", "Item Specific Discount",
-        "Manufacturer Specific Discount", "Total Invoice Discount", "Price List",
-        "Customer Discount", "Free Cases", "Order Tags", "Representative"
-    ],
-    "ORDER_SALES_SUMMARY": [
-        "Customer ID", "Customer", "Billing Address", "Slotting", "Billing City",
-        "Billing State", "Billing ZIP", "Shipping Address", "Shipping City", "Shipping State",
-        "Shipping ZIP", "Order ID", "Created By", "Date Created", "Product Name",
-        "Product Price", "Product Total", "Manufacturer Name", "QTY", "Discount Type",
-        "Item Specific Discount", "Customer Discount", "Manufacturer Specific Discount",
-        "Total Invoice Discount", "Price List", "Free Cases", "Balance", "Payment Status",
-        "Expected Payment Date", "Grand Total", "Paid", "Delivery Status", "Delivered",
-        "Delivery Methods", "Order Note", "Order Status", "Customer Contact",
-        "Representative", "Order Tags", 'Payment Methods', 'Fulfill By'
-    ],
-    "TOP_CUSTOMERS": [
-        "Business Name", "Shipping Address", "Shipping City", "Shipping State",
-        "Shipping ZIP", "Billing Address", "Billing City", "Billing State", "Billing ZIP",
-        "Group", "Territory", "Total Orders", "Total Sales", "Customer Specific Discount",
-        "Price List", "Primary Payment Method", "Has Order Direct", "Payment Terms",
-        "Contact Name", "Contact Role", "Contact Phone", "Contact Email", "Business Phone",
-        "Business Email", "Business Fax", "Website", "Tags", "Licenses & Certifications", 'Lead Status', 'Representatives'
-    ],
-    "CUSTOMER_DETAILS": [
-        "Business Name", "Shipping Address", "Shipping City", "Shipping State",
-        "Shipping ZIP", "Billing Address", "Billing City", "Billing State", "Billing ZIP",
-        "Group", "Territory", "Total Orders", "Total Sales", "Customer Specific Discount",
-        "Price List", "Primary Payment Method", "Has Order Direct", "Payment Terms",
-        "Contact Name", "Contact Role", "Contact Phone", "Contact Email", "Business Phone",
-        "Business Email", "Business Fax", "Website", "Tags", "Licenses & Certifications", 'Lead Status', 'Representatives'
-    ],
-    "PAYMENTS": ["Order ID", "Created By", "Date Created", "Customer ID", "Business Name", "Payment Status", "Expected Payment Date", "Type",
-                  "Payment Method", "Reference #", "Note", "Payment Date", "Payment Amount", "Processed By", "Order Balance"]
-}
 import pandas as pd
 import logging
 from typing import Dict, List
 
 
+CHECK_SAMPLE_ROWS = 500
+# Shared-cache key suffix of the preprocessed frame the charts use
+PREPARED_SUFFIX = ":prepared"
+# Upper bound on cached answers / charts per AI function, the memory budget applies on top
+AI_CACHE_ENTRIES = int(os.getenv('AI_CACHE_ENTRIES', 100))
+# CSV exports kept for download, one per report version
+CSV_EXPORT_ENTRIES = int(os.getenv('CSV_EXPORT_ENTRIES', 4))
+# Diagnostics expose server-wide usage (every session's reports), off unless enabled by the operator
+SHOW_DIAGNOSTICS = int(os.getenv('SHOW_DIAGNOSTICS', 0))
+
+
 def check_report(file_path: str, report_type: str, url_name) -> Dict:
     """
     Validate a report file against expected columns for a given report type.
+
+    Only the header and the first CHECK_SAMPLE_ROWS rows are read, so the check
+    costs the same for any file size. Dtype conformance and null ratios of the
+    sample are logged.
     
     Returns:
         Dictionary with validation results:
@@ -150,9 +80,10 @@ def check_report(file_path: str, report_type: str, url_name) -> Dict:
             raise ValueError(f"Invalid report type: {report_type}. "
                              f"Valid types: {list(EXPECTED_COLUMNS.keys())}")
 
-        # Read CSV
-        df = pd.read_csv(file_path)
-        actual_columns = df.columns.tolist()
+        # Read the header and a bounded sample only
+        sample = report_io.read_sample(file_path, CHECK_SAMPLE_ROWS)
+        actual_columns = sample.columns.tolist()
+        sample_check = check_sample(sample, report_type)
 
         # Check columns
         missing = [col for col in expected if col not in actual_columns]
@@ -177,6 +108,10 @@ def check_report(file_path: str, report_type: str, url_name) -> Dict:
         if not count_match:
             logging.warning(f"[{report_type}] Column count mismatch. "
                             f"Expected {len(expected)}, found {len(actual_columns)}")
+        if sample_check['dtype_mismatches']:
+            logging.warning(f"[{report_type}] Dtype mismatches in sample: {sample_check['dtype_mismatches']}")
+        if sample_check['high_null_columns']:
+            logging.warning(f"[{report_type}] Mostly empty columns in sample: {sample_check['high_null_columns']}")
 
         return result
 
@@ -207,7 +142,6 @@ def check_report(file_path: str, report_type: str, url_name) -> Dict:
 load_dotenv()
 
 fastapi_url = os.getenv('FASTAPI_URL')
-NUMBER_SHOWN_ROWS = 8000
 log_file_path = "logging_file.log"
 logging.basicConfig(
     level=logging.INFO,
@@ -228,7 +162,7 @@ def window_name():
             st.session_state["dir_name"] = dir_name
         
         
-        UPLOAD_DIR = f"uploads\\{st.session_state.dir_name}\\"
+        UPLOAD_DIR = upload_workspace.workspace_dir(st.session_state.dir_name)
         if not os.path.exists(UPLOAD_DIR):
             os.makedirs(UPLOAD_DIR)
 
@@ -274,53 +208,11 @@ css='''
 st.markdown(css, unsafe_allow_html=True)
 
 
-def convert_excel_to_csv(excel_file_path):
-    try:
-        #print(f"Converting file: {excel_file_path}")
-        
-        # 1. Attempt with Calamine (Highly resilient to malformed .xlsx files)
-        try:
-            df = pd.read_excel(excel_file_path, engine='calamine')
-            #print("Successfully read using calamine engine.")
-            
-        except ImportError:
-            #print("Calamine not installed. Trying default pandas reader...")
-            try:
-                df = pd.read_excel(excel_file_path)
-            except ValueError as e:
-                if "NaN" in str(e):
-                    #print("openpyxl hit the NaN bug. Trying as disguised CSV...")
-                    # Sometimes systems output CSVs but name them .xlsx
-                    df = pd.read_csv(excel_file_path)
-                else:
-                    raise e
-                    
-        # 2. Clean the data for Streamlit/Gradio compatibility
-        df.columns = df.columns.astype(str).str.strip()
-        df = df.replace(r'\n', ' ', regex=True)
-        df = df.replace(r'\r', ' ', regex=True)
-        
-        # 3. Save as CSV
-        csv_file_path = os.path.splitext(excel_file_path)[0] + ".csv"
-        df.to_csv(csv_file_path, index=False, encoding='utf-8')
-        
-        # 4. Clean up original file
-        if os.path.exists(excel_file_path):
-            os.remove(excel_file_path)
-            
-        return csv_file_path
-        
-    except Exception as e:
-        print(f" Critical failure during conversion: {str(e)}")
-        return None
-
-
-
 async def read_csv(file_path):
     loop = asyncio.get_event_loop()
     return await loop.run_in_executor(None, pd.read_csv, file_path)
 
-@st.cache_data(show_spinner=False)
+@st.cache_data(show_spinner=False, max_entries=AI_CACHE_ENTRIES)
 def chat_with_file(prompt, file_path, grand_total_value):
     #file_name = get_file_name()
     #last_uploaded_file_path = os.path.join(UPLOAD_DIR, file_name)
@@ -342,14 +234,15 @@ def chat_with_file(prompt, file_path, grand_total_value):
     except Exception as e:
         return {"error": str(e)}
 
-@st.cache_data(show_spinner=False)
+@st.cache_data(show_spinner=False, max_entries=AI_CACHE_ENTRIES)
 def chat_with_agent(input_string, file_path):
     try:
-        # Assuming file_path is always CSV after conversion
+        # file_path is the stored Parquet dataset, the agent gets the typed frame directly
         #api_key = os.getenv('Chat_Api') ,openai_api_key=api_key
-        agent = create_csv_agent(
+        ChatOpenAI, create_pandas_dataframe_agent, AgentType = ai_imports.agent_toolkit()
+        agent = create_pandas_dataframe_agent(
             ChatOpenAI(temperature=0, model="gpt-4o"),
-            file_path,
+            report_io.read_dataset(file_path),
             verbose=False,
             agent_type=AgentType.OPENAI_FUNCTIONS
         )
@@ -365,12 +258,10 @@ def chat_with_agent(input_string, file_path):
 def fetch_file_info():
     try:
         link = fastapi_url + "/get_file_info/"
-        response = requests.get(link)
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        data = response.json()
+        data = http_client.get_json(link)
         #print(f"Data received from FastAPI: {data}")
         return data
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logging.error("Request failed: %s", e)
         st.success("""**Important Notice**
         \nThis page was reloaded due to a manual refresh.\n To proceed, please close this window and run the report again from **Simply Depo**. Avoid refreshing the page to ensure smooth operation and avoid interruptions. Thank you for your cooperation.
@@ -384,84 +275,110 @@ def fetch_file_info():
         st.stop()
 
 
+def get_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "default"
+
+
 #@st.cache_data(show_spinner=False)
-def cache_df(last_uploaded_file_path):
+def cache_df(last_uploaded_file_path, report_type=None):
     try:
-        if 'df' not in st.session_state:
-                df = pd.read_csv(last_uploaded_file_path, low_memory=False)
-                #df_limited = df.head(NUMBER_SHOWN_ROWS)
-                st.session_state["df"] = df  #df_limited
-
-        df = st.session_state["df"]
+        # One typed frame per report content is shared by every session viewing it,
+        # each session works on a shallow view
+        report_key = f"{st.session_state.get('report_hash', last_uploaded_file_path)}:{report_type}"
+        previous_key = st.session_state.get("df_key")
+        if previous_key and previous_key != report_key:
+            shared_cache.release(previous_key, get_session_id())
+            shared_cache.release(previous_key + PREPARED_SUFFIX, get_session_id())
+        st.session_state["df_key"] = report_key
+
+        # Loads (and reloads after a memory-budget eviction) come from the report store,
+        # the session's upload folder copy is only a fallback
+        report_hash = st.session_state.get('report_hash')
+        source_path = (report_hash and report_store.lookup_hash(report_hash, report_io.DATASET_EXT)) \
+            or last_uploaded_file_path
+        df = shared_cache.get_view(
+            report_key, get_session_id(),
+            # Typed read from the schema registry: categoricals, float64 money, parsed dates,
+            # then lossless compaction of the remaining columns
+            lambda: frame_compact.compact(read_report(source_path, report_type))
+        )
     except Exception as e:
         st.warning("There is some error with data, try to update the session")
         st.stop()
     return df
 
-def id_str(value):
-    if isinstance(value, (int, float)):
-        return f"{value:.0f}"
-    elif isinstance(value, str) and value.replace(",", "").isdigit():
-        return f"{float(value.replace(',', '')):.0f}"
-    else:
-        return value
+def prepared_df(df, report_type):
+    """
+    Report frame cleaned by report_preprocess for the charts.
 
-def format_phone_number(phone_number):
-    # Convert input to string
-    phone_str = str(phone_number)
-    
-    # Return if it's a special case (e.g., starts with '$')
-    if phone_str.startswith('$'):
-        return phone_str
-        
-    # Extract only digits from the string
-    digits = ''.join(filter(str.isdigit, phone_str))
-    
-    # Handle 11-digit numbers (with leading '1' country code)
-    if len(digits) == 11 and digits.startswith("1"):
-        return f"+{digits[0]} ({digits[1:4]}) {digits[4:7]}-{digits[7:]}"
-    
-    # Handle 10-digit numbers
-    elif len(digits) == 10:
-        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
-    
-    # Handle numeric strings that might be floats
-    else:
-        try:
-            # Convert to float then to int to remove decimals
-            num = float(phone_str)
-            digits_float = f"{num:.0f}"
-            # Check formatted float as 11-digit
-            if len(digits_float) == 11 and digits_float.startswith("1"):
-                return f"+{digits_float[0]} ({digits_float[1:4]}) {digits_float[4:7]}-{digits_float[7:]}"
-            # Check formatted float as 10-digit
-            elif len(digits_float) == 10:
-                return f"({digits_float[:3]}) {digits_float[3:6]}-{digits_float[6:]}"
-        except (ValueError, TypeError):
-            pass  # Fall through to return original
-        
-        # Return original if no valid format matches
-        return phone_str
+    Built once per report version and shared across sessions like the raw frame,
+    each rerun only gets a cached view with the original dtypes restored. Line-item
+    reports also get their order table built here.
+    """
+    steps = report_registry.preprocess_steps(report_type)
+    key = st.session_state["df_key"] + PREPARED_SUFFIX
+    view = shared_cache.get_view(
+        key, get_session_id(),
+        lambda: frame_compact.compact(report_preprocess.preprocess(frame_compact.expand(df), report_type, steps))
+    )
+    # Expanded once per report version, reruns get a shallow copy
+    prepared = frame_compact.expanded(key, view)
+    # Lets order_index recognise the full report frame in the charts
+    prepared.attrs[order_index.REPORT_KEY_ATTR] = key
+    if report_registry.uses_order_index(report_type) and not order_index.has(key):
+        # Built once per report version, again only after a memory-budget eviction
+        order_index.build(key, prepared)
+    return prepared
+
+@st.cache_data(show_spinner=False, max_entries=CSV_EXPORT_ENTRIES)
+def export_report_csv(content_hash, path):
+    """
+    CSV bytes of a stored report, built on request and shared by every session.
 
-def add_dollar_sign(value):
-    try:
-        # Only format if value is numeric and doesn't already start with $
-        if not str(value).startswith('$'):
-            return f"${float(value):.2f}"
-        else:
-            return value
-    except ValueError:
-        return value
+    Args:
+        content_hash: Report version, the cache key.
+        path: Stored Parquet file of that version.
+    """
+    return report_io.export_csv(path)
+
+def show_table(df, report_key, report_type=None):
+    """
+    Paged report table with server-side search and sort.
+
+    Only the current page is sent to the browser; every row is reachable through
+    the page selector.
+    """
+    search_col, sort_col, order_col, page_col = st.columns([3, 3, 2, 2])
+    search = search_col.text_input("Search", key=f"table_search_{report_key}").strip()
+    sort_by = sort_col.selectbox("Sort by", [None] + list(df.columns),
+                                 format_func=lambda col: "Report order" if col is None else col,
+                                 key=f"table_sort_{report_key}")
+    ascending = order_col.selectbox("Order", ["Ascending", "Descending"],
+                                    key=f"table_order_{report_key}") == "Ascending"
+
+    positions = table_view.row_positions(report_key, df, sort_by, ascending, search)
+    pages = table_view.page_count(positions)
+    page = page_col.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, step=1,
+                                 key=f"table_page_{report_key}_{sort_by}_{ascending}_{search}")
+
+    df_page, config = table_view.get_page(report_key, report_type, df, sort_by, ascending, search, int(page))
+    st.dataframe(df_page, column_config=config, use_container_width=False)
+    start = (int(page) - 1) * table_view.PAGE_SIZE
+    st.caption(f"Rows {min(start + 1, len(positions)):,}–{min(start + table_view.PAGE_SIZE, len(positions)):,} "
+               f"of {len(positions):,}" + (f" matching, {len(df):,} total" if search else ""))
 
 def big_main():
     #st.write(st.session_state.last_uploaded_file_path)
-    df = cache_df(st.session_state.last_uploaded_file_path)
+    df = cache_df(st.session_state.last_uploaded_file_path, st.session_state.get("file_name"))
     df.index = range(1, len(df) + 1)
     file_type = identify_file(UPLOAD_DIR)
     
     #session block
     if 'AI_appear' not in st.session_state:
         st.session_state.AI_appear = False
+    if ai_imports.AI_PREWARM:
+        ai_imports.prewarm()
     if 'input_text' not in st.session_state:
         st.session_state.input_text = ''
     if 'input_text_img' not in st.session_state:
@@ -532,220 +449,24 @@ def big_main():
                     #some grand total hand fix count and agent feed
                     # Convert Grand Total to numeric
                     try:
-                        data = df.copy()
-                        grand_total_col, order_id_col, customer_col='Grand total', 'Order Id', 'Customer'
-
-                        data[grand_total_col] = pd.to_numeric(data[grand_total_col], errors='coerce')
-                        data = data.dropna(subset=[grand_total_col])
+                        grand_total_col, order_id_col, customer_col='Grand Total', 'Order ID', 'Customer'
 
                         # Step 1: Remove duplicate orders (keep first occurrence per Order ID)
-                        unique_orders = data.drop_duplicates(subset=[order_id_col])
+                        unique_orders = order_index.orders(prepared_df(df, report_registry.key_for_display_name(file_type)), order_id_col)
+                        unique_orders[grand_total_col] = pd.to_numeric(unique_orders[grand_total_col], errors='coerce')
+                        unique_orders = unique_orders.dropna(subset=[grand_total_col])
     
                         # Step 2: Calculate total sales per customer using de-duplicated data
-                        customer_sales = unique_orders.groupby(customer_col)[grand_total_col].sum()
-                        grand_total_value = customer_sales #sum(customer_sales)
-                        #print(f"${grand_total_value:,.0f}")
+                        customer_sales = unique_orders.groupby(customer_col, observed=True)[grand_total_col].sum()
+                        # The prompt expects one amount for all customers
+                        grand_total_value = round(float(customer_sales.sum()), 2)
                     except Exception as e:
                         grand_total_value = 'There is no information about this, so the answer cannot be calculated'
                         pass
                     
-                    column_functions = {
-                        'Customer ID': id_str,
-                        'ID': id_str,
-                        'Order ID': id_str,
-                        'Order ID': id_str,
-                        'Grand Total': add_dollar_sign,
-                        'Cost': add_dollar_sign,
-                        'Payment Amount': add_dollar_sign,
-                        'Order Balance': add_dollar_sign,
-                        'Paid': add_dollar_sign,
-                        'Item Specific Discount': add_dollar_sign,
-                        'Manufacturer Specific Discount': add_dollar_sign,
-                        'Total Invoice Discount': add_dollar_sign,
-                        'Customer Discount': add_dollar_sign,
-                        'Balance': add_dollar_sign,
-                        'Product Price': add_dollar_sign,
-                        'Product Total': add_dollar_sign,
-                        'Wholesale Price': add_dollar_sign,
-                        'Retail Price': add_dollar_sign,
-                        'Phone Number': format_phone_number,
-                        'Contact Phone': format_phone_number,
-                        'Total Sales' : add_dollar_sign,
-                        'Shipping ZIP' : id_str,
-                        'Shipping Zip' : id_str,
-                        'Billing ZIP' : id_str,
-                        'Billing Zip' : id_str,
-                        'Total Revenue': add_dollar_sign
-                    }
-
-                    if file_type == "Representative Details report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-                            else:
-                                pass
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except:
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type == "Customer Details report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except:
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type == "Top Customers report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except:
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type == "Order Sales Summary report":
-                        df_show = df.copy()
-                        _NUMBER_SHOWN_ROWS = 6000
-                        df_show  = df_show.head(_NUMBER_SHOWN_ROWS)
-
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except:
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type == "SKU's Not Ordered report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-
-                        
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except:
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type == "Reps Summary report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-                        
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except:
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type == "Product fulfillment report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-                        
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except Exception as e:
-                            #print(e)
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type == "Low Stock Inventory report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-                        
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except:
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type =="Best Sellers report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-                        
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-                        
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except:
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type == "3rd Party Sales Summary report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-                        
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-                        
+                    if report_registry.key_for_display_name(file_type) is not None:
                         try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except:
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type == "Current Inventory report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-                        
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-                        
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except:
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type == "Inventory Depletion report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-                        
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-                        
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except:
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type == "Payments report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-                        
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-                        
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
-                        except:
-                            st.warning("Data display error, try reloading the report")
-                    elif file_type == "Reps visits report":
-                        df_show = df.copy()
-                        df_show  = df_show.head(NUMBER_SHOWN_ROWS)
-                        
-                        for column, func in column_functions.items():
-                            if column in df_show.columns:
-                                df_show[column] = df_show[column].apply(func)
-                        
-                        try:
-                            st.dataframe(df_show, use_container_width=False)
+                            show_table(df, st.session_state["df_key"], st.session_state.get("file_name"))
                         except:
                             st.warning("Data display error, try reloading the report")
                     else:
@@ -798,6 +519,8 @@ def big_main():
         
         def click_AI_Appear():
             st.session_state.AI_appear = True
+            # Load LangChain / LIDA while the user reads the notice and types a question
+            ai_imports.prewarm()
         
         button_AI_appear = st.button('Analyze with AI', on_click=click_AI_Appear, key=888)
         
@@ -1013,6 +736,7 @@ def big_main():
                                             with st.spinner(text="Analyzing Your Request..."):
                                                 if "chat_result" not in st.session_state:
                                                         st.session_state["chat_result"] = chat_with_file(user_prompt, last_uploaded_file_path, grand_total_value)
+                                                        track_ai_result("chat_result", st.session_state["chat_result"])
                                                         #chat_result = st.session_state["chat_result"]
                                                         #chat_result = chat_with_file(input_text, last_uploaded_file_path)
                                                         if "response" in st.session_state["chat_result"]:
@@ -1037,6 +761,7 @@ def big_main():
                                                     #with st.spinner(text="In progress..."):
                                                         chat_result = chat_with_file(user_prompt, last_uploaded_file_path, grand_total_value)
                                                         st.session_state["chat_result"] = chat_result
+                                                        track_ai_result("chat_result", chat_result)
                                                         #rr = os.getenv("OPENAI_API_KEY")
                                                         #st.write(rr)
                                                         #st.write(st.session_state["chat_result"])
@@ -1152,7 +877,9 @@ def big_main():
                                                 with st.container(border=True):
                                                     try:
                                                         st.write('<span class="red-frame"/>', unsafe_allow_html=True)
-                                                        plot_result = test_plot_maker(df, input_text2)
+                                                        # LIDA summarizes the data with the original dtypes
+                                                        plot_result = test_plot_maker(frame_compact.expanded(st.session_state["df_key"], df), input_text2)
+                                                        track_ai_result("plot_result", None)
                                                         st.plotly_chart(plot_result)
                                                     except Exception as e:
                                                         st.warning("There is some error with data visualization, try to give query more details")
@@ -1198,25 +925,11 @@ def big_main():
                 """],
             ):
 
-        report_function_map = {
-            '3rd Party Sales Summary report': third_party_sales_summary.report_func,
-            'Order Sales Summary report': order_sales_summary.report_func,
-            'Best Sellers report': best_sellers.report_func,
-            'Representative Details report': rep_details.report_func,
-            'Reps Summary report': reps_summary.report_func,
-            "SKU's Not Ordered report": sku_not_ordered.report_func,
-            'Low Stock Inventory report': low_stock_inventory.report_func,
-            'Current Inventory report': current_inventory.report_func,
-            'Top Customers report': top_customers.report_func,
-            'Customer Details report': customer_details.report_func,
-            'Inventory Depletion report': inventory_depletion.report_func,
-            'Reps visits report': reps_visits.report_func,
-            'Product fulfillment report': product_fulfillment.report_func,
-            'Payments report': payments.report_func
-        }
-        if file_type in report_function_map:
+        report_key = report_registry.key_for_display_name(file_type)
+        if report_key is not None:
             try:
-                report_function_map[file_type](df)
+                # Only the opened report's module (and its visualizations) gets imported
+                report_registry.report_func(report_key)(prepared_df(df, report_key))
             except Exception as e:
                 st.success("Important technical work is underway, please try again later")
         else:
@@ -1236,27 +949,6 @@ def main_viz():
     #        st.write(st.session_state.result)
     #except Exception as e:
     #    pass
-    async def cleanup_uploads_folder(upload_dir: str):
-        try:
-            # Pause for 0.5 seconds asynchronously
-            await asyncio.sleep(0.3)
-
-            # List all files in the directory
-            files = [file for file in os.listdir(upload_dir) if os.path.isfile(os.path.join(upload_dir, file))]
-
-            # If there is more than one file, proceed with cleanup
-            if len(files) > 1:
-                for filename in files:
-                    file_path = os.path.join(upload_dir, filename)
-                    os.unlink(file_path)
-            # else:
-            #    st.info("Only one file found in the folder; no cleanup necessary.")
-
-        except Exception as e:
-            logger.error(f"Something went wrong during cleanup: {e}")
-            #st.warning(f"Something went wrong during cleanup: {e}")
-                #logging.error(f"Error cleaning up uploads folder: {str(e)}")
-
     try:
         if "result" not in st.session_state:
             try:
@@ -1290,68 +982,82 @@ def main_viz():
     
     #filename = get_file_name()
     #st.write(filename)
-    UPLOAD_DIR = f"uploads\\{user_id}\\"
-    if not os.path.exists(UPLOAD_DIR):
-        os.makedirs(UPLOAD_DIR)
-    #filename = get_file_name(UPLOAD_DIR)
-    if "clean" not in st.session_state:
-        st.session_state["clean"] = True
-    asyncio.run(cleanup_uploads_folder(UPLOAD_DIR)) #if wanna make one time than add in if state "clean"
+    # Tracked workspace: files are listed in its manifest and expire with it
+    UPLOAD_DIR = upload_workspace.open_workspace(user_id)
 
     #last_uploaded_file_path = os.path.join(UPLOAD_DIR, filename)
 
-    report_type_filenames = {
-        'CUSTOMER_DETAILS': 'customer_details.xlsx',
-        'TOP_CUSTOMERS': 'top_customers.xlsx',
-        'ORDER_SALES_SUMMARY': 'order_sales_summary.xlsx',
-        'THIRD_PARTY_SALES_SUMMARY': 'third_party_sales_summary.xlsx',
-        'CURRENT_INVENTORY': 'current_inventory.xlsx',
-        'LOW_STOCK_INVENTORY': 'low_stock_inventory.xlsx',
-        'BEST_SELLERS': 'best_sellers.xlsx',
-        'SKU_NOT_ORDERED': 'sku_not_ordered.xlsx',
-        'REP_DETAILS': 'rep_details.xlsx',
-        'REPS_SUMMARY': 'reps_summary.xlsx',
-        'INVENTORY_DEPLETION': 'inventory_depletion.xlsx',
-        'REPS_VISITS': 'reps_visits.xlsx',
-        'PRODUCT_FULFILLMENT': 'product_fulfillment.xlsx',
-        'PAYMENTS': 'payments.xlsx'
-    }
-    try:
-        response = requests.get(url_name, stream=True)
-        response.raise_for_status()
-    except Exception as e: #if error with file_link
-        st.warning("Something wrong with data. Try to rerun the report.")
-        st.stop()
-
-    friendly_filename = report_type_filenames.get(file_name_, 'unknown.xlsx')
+    friendly_filename = report_registry.file_name(file_name_)
     excel_file_path = os.path.join(UPLOAD_DIR, friendly_filename)
-    
-    #if "file_download" not in st.session_state:
-    with open(excel_file_path, "wb") as file:
-        for chunk in response.iter_content(chunk_size=8192):
-            file.write(chunk)
-    #    st.session_state.file_download = True
-    
-    excel_files_pattern = os.path.join(UPLOAD_DIR, '*.xls*')
-    time.sleep(0.3)
-    # Use glob to find all Excel files in the folder
-    excel_files = glob.glob(excel_files_pattern)
-
-    if excel_files:
-        for excel_file in excel_files:
-            try:
-                if "last_uploaded_file_path" not in st.session_state:
-                    st.session_state.last_uploaded_file_path = convert_excel_to_csv(excel_file)
-                else:
-                    #pass
-                    st.session_state.last_uploaded_file_path = convert_excel_to_csv(excel_file)
-            except Exception as e:
-                st.success("This report is currently being updated and is temporarily unavailable. Please try again later.")
+    dataset_file_path = report_io.dataset_path_for(excel_file_path)
+
+    # Reruns and other sessions opening the same link are served from the report store.
+    # Past REPORT_MAX_AGE the link is revalidated with a conditional request,
+    # only a changed or unknown report pays for the body and the Excel conversion
+    stored = report_store.lookup(url_name, max_age=REPORT_MAX_AGE)
+    if stored is not None and stored["fresh"]:
+        content_hash, stored_path = stored["hash"], stored["path"]
+    else:
+        try:
+            download = download_report(
+                url_name, excel_file_path,
+                etag=stored.get("etag") if stored else None,
+                last_modified=stored.get("last_modified") if stored else None
+            )
+        except Exception as e: #if error with file_link
+            if stored is None:
+                st.warning("Something wrong with data. Try to rerun the report.")
                 st.stop()
+            # Origin unreachable: serve the stored copy but keep it due for revalidation
+            report_store.mark_stale(url_name, e)
+            download = None
+
+        if download is None:
+            content_hash, stored_path = stored["hash"], stored["path"]
+        elif download['not_modified']:
+            report_store.mark_not_modified(url_name)
+            content_hash, stored_path = stored["hash"], stored["path"]
+        else:
+            content_hash = download['hash']
+            stored_path = report_store.lookup_hash(content_hash, ext=report_io.DATASET_EXT)
+            if stored_path is None:
+                # The download was renamed into place complete, no need to wait before converting
+                conversion = convert_in_pool(excel_file_path)
+                if conversion['reason'] in ('timeout', 'memory'):
+                    st.warning(f"This report is too large to process right now ({conversion['error']}). Please try a smaller date range.")
+                    st.stop()
+                try:
+                    if conversion['path'] is None:
+                        raise ValueError(conversion['error'])
+                    stored_path = report_store.put(url_name, content_hash, conversion['path'], ext=report_io.DATASET_EXT,
+                                                   etag=download['etag'], last_modified=download['last_modified'])
+                except Exception as e:
+                    st.success("This report is currently being updated and is temporarily unavailable. Please try again later.")
+                    st.stop()
+            else:
+                # Same workbook behind a new link - reuse the converted copy
+                os.remove(excel_file_path)
+                report_store.link(url_name, content_hash, ext=report_io.DATASET_EXT,
+                                  etag=download['etag'], last_modified=download['last_modified'])
+
+    st.session_state["report_hash"] = content_hash
+    # Record type, path, hash and columns once per ingested report; identification
+    # on later reruns reads this record instead of scanning the upload folder
+    report_manifest = st.session_state.get("report_manifest")
+    if report_manifest is None or report_manifest['hash'] != content_hash or not os.path.exists(report_manifest['path']):
+        dataset_path = report_store.materialize(stored_path, dataset_file_path)
+        st.session_state["report_manifest"] = upload_workspace.keep_only(
+            user_id, dataset_path, report_type=file_name_, content_hash=content_hash,
+            columns=report_io.read_columns(dataset_path))
+    st.session_state.last_uploaded_file_path = st.session_state["report_manifest"]['path']
     #st.success(f"This is   type. File is available for visualization.")
     last_uploaded_file_path = st.session_state.last_uploaded_file_path
     report_name_title = identify_file_mini(file_name_)
     st.title(f"Report: {report_name_title}", anchor=None)
+    # Reports are stored as Parquet; the CSV is only built when asked for
+    if st.button("Export as CSV", key=f"export_csv_{content_hash}"):
+        st.download_button("Download CSV", export_report_csv(content_hash, last_uploaded_file_path),
+                           file_name=f"{file_name_}.csv", mime="text/csv")
     
     if "file_result_check" not in st.session_state:
         st.session_state["file_result_check"] = True
@@ -1366,9 +1072,10 @@ def main_viz():
         st.rerun()
     
     big_main()
+    show_diagnostics()
     
 
-@st.cache_data(show_spinner=False)
+@st.cache_data(show_spinner=False, max_entries=AI_CACHE_ENTRIES)
 def test_plot_maker(df, text):
     from lida import Manager, TextGenerationConfig, llm
     from lida.datamodel import Goal
@@ -1398,5 +1105,48 @@ def test_plot_maker(df, text):
         st.warning("No visualizations were generated for this query.")    
 
 
+AI_CACHES = {
+    "chat_with_file": chat_with_file,
+    "chat_with_agent": chat_with_agent,
+    "test_plot_maker": test_plot_maker,
+}
+
+
+def _ai_cache_items():
+    return [{'key': name, 'bytes': memory_governor.cache_data_bytes(name),
+             'last_access': memory_governor.last_touched("ai_cache", name), 'sessions': []}
+            for name in AI_CACHES]
+
+
+# st.cache_data cannot drop single entries, an evicted AI cache is cleared as a whole
+memory_governor.register_pool("ai_cache", _ai_cache_items, lambda name: AI_CACHES[name].clear())
+
+
+def track_ai_result(label, result):
+    """Mark the AI caches as used, account the session's answer and apply the memory budget."""
+    if label == "chat_result":
+        memory_governor.touch("ai_cache", "chat_with_file")
+        memory_governor.touch("ai_cache", "chat_with_agent")
+        memory_governor.record_session(get_session_id(), label, len(json.dumps(result, default=str)))
+    else:
+        memory_governor.touch("ai_cache", "test_plot_maker")
+    memory_governor.enforce()
+
+
+def show_diagnostics():
+    """
+    Memory and cache usage of this process, shown with ?diagnostics=1 in the URL
+    when the server runs with SHOW_DIAGNOSTICS=1.
+    """
+    if not SHOW_DIAGNOSTICS or st.query_params.get("diagnostics") != "1":
+        return
+    with st.expander("Diagnostics"):
+        st.json({
+            "memory": memory_governor.usage(),
+            "shared_cache": shared_cache.stats(),
+            "report_store": report_store.stats(),
+        })
+
+
 if __name__ == "__main__":
     main_viz()
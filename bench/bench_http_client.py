@@ -0,0 +1,98 @@
+"""
+Latency of fetch_file_info against a local FastAPI stand-in for /get_file_info/:
+a bare requests.get per call (before) versus the pooled http_client (after).
+
+    python bench/bench_http_client.py [--calls 200] [--delay-ms 0]
+"""
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import threading
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+from fastapi import FastAPI
+import http_client
+
+app = FastAPI()
+DELAY = 0.0
+
+
+@app.get("/get_file_info/")
+async def get_file_info():
+    if DELAY:
+        await asyncio.sleep(DELAY)
+    return {"url": "https://example.com/report.xlsx", "file_name": "ORDER_SALES_SUMMARY", "user_id": "1"}
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(port):
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def _measure(call, calls):
+    call()  # warm-up: imports, first connection
+    timings = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1e3)
+    timings.sort()
+    return {'mean': statistics.mean(timings), 'p50': timings[len(timings) // 2],
+            'p95': timings[int(len(timings) * 0.95) - 1]}
+
+
+def main():
+    global DELAY
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--delay-ms", type=float, default=0, help="server-side processing time per call")
+    args = parser.parse_args()
+    DELAY = args.delay_ms / 1e3
+
+    port = _free_port()
+    server = _serve(port)
+    url = f"http://127.0.0.1:{port}/get_file_info/"
+
+    try:
+        import requests
+
+        def before():
+            response = requests.get(url)
+            response.raise_for_status()
+            return response.json()
+        label = "requests.get per call"
+    except ImportError:
+        import httpx
+
+        def before():
+            response = httpx.get(url)
+            response.raise_for_status()
+            return response.json()
+        label = "httpx.get per call"
+
+    results = {label: _measure(before, args.calls),
+               "http_client.get_json (pooled)": _measure(lambda: http_client.get_json(url), args.calls)}
+    server.should_exit = True
+
+    print(f"{args.calls} calls to {url}")
+    for name, result in results.items():
+        print(f"  {name:32s} mean {result['mean']:6.2f} ms  p50 {result['p50']:6.2f} ms  p95 {result['p95']:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
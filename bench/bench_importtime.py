@@ -0,0 +1,51 @@
+"""
+Cold-start cost of the AI imports, measured with python -X importtime: the import
+block app.py had at module top (before) versus ai_imports, which is all app.py
+imports for the AI panel now (after).
+
+    python bench/bench_importtime.py [--runs 5]
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BEFORE = """
+import openai
+from langchain_openai import ChatOpenAI
+from langchain.agents import AgentExecutor
+from langchain_experimental.agents.agent_toolkits import create_pandas_dataframe_agent
+from langchain.agents.agent_types import AgentType
+"""
+AFTER = "import ai_imports"
+
+
+def import_seconds(statement):
+    """Sum of the cumulative times of the top-level imports -X importtime reports."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented under their parent, only top-level ones are summed
+        if not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    return total_us / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    for label, statement in (("before (AI imports at top)", BEFORE), ("after (ai_imports)", AFTER)):
+        runs = [import_seconds(statement) for _ in range(args.runs)]
+        print(f"{label:28s} median {statistics.median(runs):6.3f} s  (min {min(runs):.3f}, max {max(runs):.3f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+sanitize_text_columns against the previous two full-frame regex replaces, on synthetic
+frames shaped like ORDER_SALES_SUMMARY (41 columns) and TOP_CUSTOMERS (30 columns).
+
+    python bench/bench_sanitize.py [--rows 100000] [--break-ratio 0.01]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from report_schema import EXPECTED_COLUMNS, COLUMN_DTYPES, MONEY
+from report_convert import sanitize_text_columns
+
+NUMERIC_HINTS = ("ID", "ZIP", "QTY", "Total Orders", "Discount", "Cases")
+
+
+def _is_numeric(report_type, col):
+    return COLUMN_DTYPES[report_type].get(col) == MONEY or any(hint in col for hint in NUMERIC_HINTS)
+
+
+def synthetic_report(report_type, rows, break_ratio, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col in EXPECTED_COLUMNS[report_type]:
+        if _is_numeric(report_type, col):
+            data[col] = rng.integers(0, 100000, rows) / 100
+        else:
+            words = np.array([f"{col} value {i}" for i in range(200)], dtype=object)
+            values = words[rng.integers(0, len(words), rows)]
+            broken = rng.random(rows) < break_ratio
+            values[broken] = [f"line one\nline two\r{i}" for i in range(int(broken.sum()))]
+            data[col] = pd.Series(values, dtype=object)
+    return pd.DataFrame(data)
+
+
+def old_sanitize(df):
+    return df.replace(r'\n', ' ', regex=True).replace(r'\r', ' ', regex=True)
+
+
+def _time(func, df, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        frame = df.copy()
+        started = time.perf_counter()
+        result = func(frame)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--break-ratio", type=float, default=0.01, help="share of text cells with a line break")
+    args = parser.parse_args()
+
+    for report_type in ("ORDER_SALES_SUMMARY", "TOP_CUSTOMERS"):
+        df = synthetic_report(report_type, args.rows, args.break_ratio)
+        old_seconds, old = _time(old_sanitize, df)
+        new_seconds, new = _time(sanitize_text_columns, df)
+        pd.testing.assert_frame_equal(new, old)
+        print(f"{report_type:20s} {df.shape[0]:,} x {df.shape[1]}: "
+              f"replace x2 {old_seconds * 1e3:8.1f} ms   sanitize_text_columns {new_seconds * 1e3:8.1f} ms   "
+              f"({old_seconds / new_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Arrow payload size and formatting time of the report table: ID and currency columns
+converted to strings (NUMERIC_RENDER=0, the old path) versus kept numeric and
+formatted by column_config (NUMERIC_RENDER=1).
+
+    python bench/bench_table_payload.py [--rows 100000] [--report ORDER_SALES_SUMMARY]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import display_format
+from display_format import ID, CURRENCY, PHONE
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_sanitize import synthetic_report
+
+
+def arrow_bytes(df):
+    # st.dataframe ships the frame as an Arrow IPC stream
+    table = pa.Table.from_pandas(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def typed_report(report_type, rows):
+    df = synthetic_report(report_type, rows, break_ratio=0)
+    rng = np.random.default_rng(1)
+    for column, kind in display_format.report_formats(report_type).items():
+        if column not in df.columns:
+            continue
+        if kind == ID:
+            df[column] = rng.integers(10000, 99999999, rows).astype(np.float64)
+        elif kind == CURRENCY:
+            df[column] = rng.integers(0, 10000000, rows) / 100
+        elif kind == PHONE:
+            df[column] = pd.Series(rng.integers(2000000000, 9999999999, rows).astype(str), dtype=object)
+    return df
+
+
+def measure(df, report_type, numeric_render):
+    display_format.NUMERIC_RENDER = numeric_render
+    formats = display_format.report_formats(report_type)
+    started = time.perf_counter()
+    formatted = display_format.format_frame(df.copy(), formats)
+    format_ms = (time.perf_counter() - started) * 1e3
+    return format_ms, arrow_bytes(formatted)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--report", default="ORDER_SALES_SUMMARY")
+    args = parser.parse_args()
+
+    df = typed_report(args.report, args.rows)
+    print(f"{args.report}, {len(df.columns)} columns")
+    for label, frame in (("page (500 rows)", df.head(500)), (f"full ({len(df):,} rows)", df)):
+        for name, numeric_render in (("strings", 0), ("numeric", 1)):
+            format_ms, size = measure(frame, args.report, numeric_render)
+            print(f"  {label:20s} {name:8s} payload {size / 1e3:10.1f} KB   formatting {format_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import logging
+import pandas as pd
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+# Date columns of a report are parsed once, at load time, with an explicit format.
+# The format is inferred from a sample of the column's values and the whole
+# column is then parsed in one vectorized pass; only values that do not match it go
+# through the slow per-value path (format='mixed' for DATE_MIXED columns).
+DATE_SAMPLE_ROWS = int(os.getenv('DATE_SAMPLE_ROWS', 1000))
+
+logger = logging.getLogger(__name__)
+
+
+def infer_format(values, sample_rows=DATE_SAMPLE_ROWS):
+    """
+    strftime format matching every value in a sample of a text column, or None.
+
+    Candidates are guessed from the distinct sampled values, the first one parsing
+    the whole sample wins.
+    """
+    sample = values.dropna().head(sample_rows)
+    if sample.empty:
+        return None
+    for value in sample.drop_duplicates().head(20):
+        fmt = guess_datetime_format(value)
+        if fmt is None:
+            continue
+        if pd.to_datetime(sample, format=fmt, errors='coerce').notna().all():
+            return fmt
+    return None
+
+
+def parse(values, mixed=False):
+    """
+    Parse a column to datetime64, invalid values become NaT.
+
+    Args:
+        values: Series of text, datetime objects or datetime64.
+        mixed: Values may come in several formats (the old format='mixed' columns).
+
+    Returns:
+        datetime64 Series with the index of values.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    fallback = {'format': 'mixed'} if mixed else {}
+    # Only text needs a format; datetime objects from the workbook convert directly
+    fmt = infer_format(values) if pd.api.types.infer_dtype(values, skipna=True) == 'string' else None
+    if fmt is None:
+        return pd.to_datetime(values, errors='coerce', **fallback)
+
+    parsed = pd.to_datetime(values, format=fmt, errors='coerce')
+    missed = parsed.isna() & values.notna()
+    if missed.any():
+        # Values in another format than the sample's
+        parsed[missed] = pd.to_datetime(values[missed], errors='coerce', **fallback)
+    logger.debug(f"Parsed {values.name} with format {fmt}, {int(missed.sum())} values needed the fallback")
+    return parsed
@@ -0,0 +1,253 @@
+import os
+import numpy as np
+import pandas as pd
+from report_schema import EXPECTED_COLUMNS, OPEN_SCHEMAS
+
+# Display formatting for the report table.
+# The scalar formatters define the output; the column formatters produce the same strings
+# with numpy on numeric columns and by formatting each distinct value once on text columns.
+# With NUMERIC_RENDER, numeric ID and currency columns are not converted at all: they stay
+# numbers in the Arrow payload and st.dataframe formats them through column_config.
+NUMERIC_RENDER = int(os.getenv('TABLE_NUMERIC_RENDER', 1))
+
+
+def id_str(value):
+    if isinstance(value, (int, float)):
+        return f"{value:.0f}"
+    elif isinstance(value, str) and value.replace(",", "").isdigit():
+        return f"{float(value.replace(',', '')):.0f}"
+    else:
+        return value
+
+def format_phone_number(phone_number):
+    # Convert input to string
+    phone_str = str(phone_number)
+
+    # Return if it's a special case (e.g., starts with '$')
+    if phone_str.startswith('$'):
+        return phone_str
+
+    # Extract only digits from the string
+    digits = ''.join(filter(str.isdigit, phone_str))
+
+    # Handle 11-digit numbers (with leading '1' country code)
+    if len(digits) == 11 and digits.startswith("1"):
+        return f"+{digits[0]} ({digits[1:4]}) {digits[4:7]}-{digits[7:]}"
+
+    # Handle 10-digit numbers
+    elif len(digits) == 10:
+        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+
+    # Handle numeric strings that might be floats
+    else:
+        try:
+            # Convert to float then to int to remove decimals
+            num = float(phone_str)
+            digits_float = f"{num:.0f}"
+            # Check formatted float as 11-digit
+            if len(digits_float) == 11 and digits_float.startswith("1"):
+                return f"+{digits_float[0]} ({digits_float[1:4]}) {digits_float[4:7]}-{digits_float[7:]}"
+            # Check formatted float as 10-digit
+            elif len(digits_float) == 10:
+                return f"({digits_float[:3]}) {digits_float[3:6]}-{digits_float[6:]}"
+        except (ValueError, TypeError):
+            pass  # Fall through to return original
+
+        # Return original if no valid format matches
+        return phone_str
+
+def add_dollar_sign(value):
+    try:
+        # Only format if value is numeric and doesn't already start with $
+        if not str(value).startswith('$'):
+            return f"${float(value):.2f}"
+        else:
+            return value
+    except ValueError:
+        return value
+
+
+def _format_fixed(values, decimals):
+    """
+    Vectorised f"{x:.{decimals}f}" for a float64 array.
+
+    Rounding |x| * 10**decimals with rint matches Python's exact decimal rounding except
+    right next to a .5 tie, where the multiplication may have rounded; those values,
+    very large values and nan/inf are formatted by Python instead.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    out = np.empty(len(x), dtype=object)
+    scale = 10 ** decimals
+    with np.errstate(invalid='ignore', over='ignore'):
+        scaled = np.abs(x) * scale
+        rounded = np.rint(scaled)
+        fast = np.isfinite(scaled)
+        if decimals:
+            fast &= (scaled < 1e9) & (np.abs(scaled - np.floor(scaled) - 0.5) > 1e-6)
+        else:
+            fast &= scaled < 9e18
+
+    # np.char fails on empty string arrays under numpy 2 (all NaN, empty or huge columns)
+    if fast.any():
+        units = rounded[fast].astype(np.int64)
+        text = (units // scale).astype(str)
+        if decimals:
+            fraction = np.char.zfill((units % scale).astype(str), decimals)
+            text = np.char.add(np.char.add(text, '.'), fraction)
+        text = np.where(np.signbit(x[fast]), np.char.add('-', text), text)
+        out[fast] = text.astype(object)
+
+    for i in np.flatnonzero(~fast):
+        out[i] = f"{x[i]:.{decimals}f}"
+    return out
+
+
+def _map_uniques(values, func):
+    """Apply a scalar formatter once per distinct value and broadcast the results."""
+    keys = values
+    if values.dtype.kind == 'f':
+        # Factorize on the bit pattern so -0.0 and 0.0 stay distinct, like str() sees them
+        keys = pd.Series(values.to_numpy(dtype=np.float64).view(np.int64))
+    codes, uniques = pd.factorize(keys)
+    if values.dtype.kind == 'f':
+        uniques = np.asarray(uniques, dtype=np.int64).view(np.float64)
+    mapped = np.empty(len(uniques), dtype=object)
+    for i, value in enumerate(uniques):
+        mapped[i] = func(value.item() if isinstance(value, np.generic) else value)
+
+    out = np.empty(len(values), dtype=object)
+    present = codes >= 0
+    out[present] = mapped[codes[present]]
+    if not present.all():
+        # Missing cells are formatted as NaN, as they were when reports were read from CSV
+        out[~present] = func(float('nan'))
+    return out
+
+
+def _is_plain_numeric(values):
+    return isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biuf'
+
+
+def format_ids(values):
+    """Column version of id_str."""
+    if _is_plain_numeric(values):
+        out = _format_fixed(values, 0)
+    else:
+        out = _map_uniques(values, id_str)
+    return pd.Series(out, index=values.index, name=values.name)
+
+
+def format_currency(values):
+    """Column version of add_dollar_sign."""
+    if _is_plain_numeric(values):
+        out = _format_fixed(values, 2)
+        if len(out):
+            out = np.char.add('$', out.astype(str)).astype(object)
+    else:
+        out = _map_uniques(values, add_dollar_sign)
+    return pd.Series(out, index=values.index, name=values.name)
+
+
+def format_phones(values):
+    """Column version of format_phone_number."""
+    return pd.Series(_map_uniques(values, format_phone_number), index=values.index, name=values.name)
+
+
+ID = "id"
+CURRENCY = "currency"
+PHONE = "phone"
+
+COLUMN_FORMATS = {
+    'Customer ID': ID,
+    'ID': ID,
+    'Order ID': ID,
+    'Grand Total': CURRENCY,
+    'Cost': CURRENCY,
+    'Payment Amount': CURRENCY,
+    'Order Balance': CURRENCY,
+    'Paid': CURRENCY,
+    'Item Specific Discount': CURRENCY,
+    'Manufacturer Specific Discount': CURRENCY,
+    'Total Invoice Discount': CURRENCY,
+    'Customer Discount': CURRENCY,
+    'Balance': CURRENCY,
+    'Product Price': CURRENCY,
+    'Product Total': CURRENCY,
+    'Wholesale Price': CURRENCY,
+    'Retail Price': CURRENCY,
+    'Phone Number': PHONE,
+    'Contact Phone': PHONE,
+    'Total Sales' : CURRENCY,
+    'Shipping ZIP' : ID,
+    'Shipping Zip' : ID,
+    'Billing ZIP' : ID,
+    'Billing Zip' : ID,
+    'Total Revenue': CURRENCY
+}
+
+FORMATTERS = {
+    ID: format_ids,
+    CURRENCY: format_currency,
+    PHONE: format_phones,
+}
+
+# printf formats st.dataframe applies to numeric columns, matching id_str / add_dollar_sign.
+# Phones have no numeric equivalent and are always formatted as text.
+NUMBER_FORMATS = {
+    ID: "%d",
+    CURRENCY: "$%.2f",
+}
+
+
+def report_formats(report_type=None):
+    """Column -> ID / CURRENCY / PHONE for one report, limited to its expected columns."""
+    expected = EXPECTED_COLUMNS.get(report_type)
+    if expected is None or report_type in OPEN_SCHEMAS:
+        return COLUMN_FORMATS
+    return {column: kind for column, kind in COLUMN_FORMATS.items() if column in expected}
+
+
+def _numeric_columns(df, column_formats):
+    return [column for column, kind in column_formats.items()
+            if kind in NUMBER_FORMATS and column in df.columns and _is_plain_numeric(df[column])]
+
+
+def column_config(df, column_formats=None):
+    """
+    st.dataframe column_config for the numeric ID and currency columns of df.
+
+    Args:
+        df: Table to show.
+        column_formats: Column -> ID / CURRENCY / PHONE, defaults to COLUMN_FORMATS.
+
+    Returns:
+        Dictionary {column: st.column_config.NumberColumn}, empty when NUMERIC_RENDER is off.
+    """
+    if not NUMERIC_RENDER:
+        return {}
+    import streamlit as st
+    column_formats = column_formats or COLUMN_FORMATS
+    return {column: st.column_config.NumberColumn(format=NUMBER_FORMATS[column_formats[column]])
+            for column in _numeric_columns(df, column_formats)}
+
+
+def format_frame(df, column_formats=None):
+    """
+    Format the display columns of a report table in one pass per column.
+
+    Numeric ID and currency columns are left as numbers when NUMERIC_RENDER is on,
+    column_config then formats them in the browser.
+
+    Args:
+        df: Table to show, modified in place.
+        column_formats: Column -> ID / CURRENCY / PHONE, defaults to COLUMN_FORMATS.
+
+    Returns:
+        The formatted DataFrame.
+    """
+    column_formats = column_formats or COLUMN_FORMATS
+    numeric = set(_numeric_columns(df, column_formats)) if NUMERIC_RENDER else set()
+    for column, kind in column_formats.items():
+        if column in df.columns and column not in numeric:
+            df[column] = FORMATTERS[kind](df[column])
+    return df
@@ -0,0 +1,160 @@
+import os
+import time
+import logging
+import threading
+import numpy as np
+import pandas as pd
+import memory_governor
+
+# Lossless compaction of the report frames held in the shared cache.
+# Repeated strings are dictionary-encoded as categoricals, integers are narrowed to the
+# smallest dtype holding their range and floats to float32 where every value survives
+# the round trip. The original dtypes are kept in df.attrs, expand() restores them
+# exactly for code (the visualizations) that relies on object/str/int64/float64 semantics.
+# Columns already typed by the schema registry are left as they are.
+# Expansions of shared frames are cached per shared-cache key (keys are content
+# addressed), so a rerun reuses them instead of rebuilding object columns.
+CATEGORY_RATIO = float(os.getenv('COMPACT_CATEGORY_RATIO', 0.5))
+ATTR = "compacted"
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_expanded = {}   # shared-cache key -> {'df', 'bytes', 'last_access'}
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _encode_strings(values):
+    non_null = values.count()
+    if not non_null:
+        return None
+    try:
+        if values.nunique(dropna=True) > CATEGORY_RATIO * non_null:
+            return None
+        encoded = values.astype("category")
+    except TypeError:
+        # Unhashable cells
+        return None
+    if not pd.api.types.is_object_dtype(values):
+        # String dtype (the pandas 3 default): astype() restores it with its own NA marker
+        return encoded, (values.dtype, None)
+    missing = values[values.isna()]
+    null = None if len(missing) and missing.iloc[0] is None else np.nan
+    return encoded, ("object", null)
+
+
+def _narrow_integers(values):
+    kind = "unsigned" if values.dtype.kind == "u" or values.min() >= 0 else "integer"
+    narrowed = pd.to_numeric(values, downcast=kind)
+    if narrowed.dtype.itemsize >= values.dtype.itemsize:
+        return None
+    return narrowed, (values.dtype.name, None)
+
+
+def _narrow_floats(values):
+    narrowed = values.astype(np.float32)
+    if not np.array_equal(narrowed.to_numpy(dtype=np.float64), values.to_numpy(), equal_nan=True):
+        return None
+    return narrowed, (values.dtype.name, None)
+
+
+def compact(df):
+    """
+    Compact a freshly loaded report in place.
+
+    Args:
+        df: Report DataFrame, as returned by report_schema.read_report.
+
+    Returns:
+        The same DataFrame; df.attrs["compacted"] maps each changed column
+        to (original dtype, null marker) for expand().
+    """
+    before = frame_bytes(df)
+    encoded = {}
+    for col in df.columns:
+        values = df[col]
+        result = None
+        if pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+            result = _encode_strings(values)
+        elif values.dtype.kind in "iu" and len(values):
+            result = _narrow_integers(values)
+        elif values.dtype == np.float64:
+            result = _narrow_floats(values)
+        if result is not None:
+            df[col], encoded[col] = result
+    df.attrs[ATTR] = encoded
+
+    after = frame_bytes(df)
+    logger.info(f"Compacted report frame {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB "
+                f"({len(encoded)} of {len(df.columns)} columns)")
+    return df
+
+
+def expand(df):
+    """
+    Return a view of a compacted frame with the original dtypes restored.
+
+    Only the compacted columns are rebuilt, the rest is shared with df.
+    """
+    encoded = df.attrs.get(ATTR)
+    if not encoded:
+        return df
+    df = df.copy(deep=False)
+    for col, (dtype, null) in encoded.items():
+        if col not in df.columns:
+            continue
+        if dtype == "object":
+            values = df[col].astype(object)
+            if null is None:
+                values = values.where(values.notna(), None)
+            df[col] = values
+        else:
+            df[col] = df[col].astype(dtype)
+    df.attrs = {key: value for key, value in df.attrs.items() if key != ATTR}
+    return df
+
+
+def expanded(key, df):
+    """
+    expand(df), built once per shared-cache key and reused by every rerun and session.
+
+    Args:
+        key: Shared-cache key df was loaded under, identifies its content.
+        df: Compacted frame (a view handed out by shared_cache).
+
+    Returns:
+        Shallow copy of the cached expansion; callers may add columns or attrs.
+    """
+    with _lock:
+        entry = _expanded.get(key)
+    if entry is None or len(entry['df']) != len(df) or not entry['df'].index.equals(df.index):
+        full = expand(df)
+        rebuilt = [col for col in df.attrs.get(ATTR, {}) if col in full.columns]
+        entry = {
+            'df': full,
+            # Only the rebuilt columns are new memory, the rest is shared with df
+            'bytes': int(full[rebuilt].memory_usage(index=False, deep=True).sum()) if rebuilt else 0,
+            'last_access': time.time(),
+        }
+        with _lock:
+            _expanded[key] = entry
+        memory_governor.enforce()
+    entry['last_access'] = time.time()
+    return entry['df'].copy(deep=False)
+
+
+def _items():
+    with _lock:
+        return [{'key': key, 'bytes': entry['bytes'], 'last_access': entry['last_access'], 'sessions': []}
+                for key, entry in _expanded.items()]
+
+
+def evict(key):
+    with _lock:
+        _expanded.pop(key, None)
+
+
+memory_governor.register_pool("expanded_frames", _items, evict)
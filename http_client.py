@@ -0,0 +1,215 @@
+import os
+import time
+import base64
+import random
+import asyncio
+import hashlib
+import logging
+import threading
+import httpx
+
+# One pooled async client for every outgoing request (FastAPI file info, report downloads).
+# It lives on a background event loop so the synchronous Streamlit script can call it
+# and all sessions reuse the same keep-alive connections.
+CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 60))
+MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Treat a 32-hex-digit ETag as the body's MD5. Only true for plain single-part S3 uploads
+# (not SSE-KMS / SSE-C or other origins), so off unless the bucket is known to qualify.
+ETAG_IS_MD5 = int(os.getenv('HTTP_ETAG_IS_MD5', 0))
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_loop = None
+_client = None
+
+
+def _get_loop():
+    global _loop, _client
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="http-client-loop", daemon=True).start()
+            _client = asyncio.run_coroutine_threadsafe(_make_client(), _loop).result()
+        return _loop
+
+
+async def _make_client():
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60),
+        follow_redirects=True,
+    )
+
+
+def _run(coro):
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+def _backoff(attempt):
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+async def _send(method, url, stream=False, **kwargs):
+    """Send a request, retrying transport errors and retryable statuses with jittered backoff."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            request = _client.build_request(method, url, **kwargs)
+            response = await _client.send(request, stream=stream)
+        except httpx.TransportError as e:
+            if attempt == MAX_RETRIES:
+                raise
+            logger.warning(f"{method} {url} failed ({e!r}), retry {attempt + 1}/{MAX_RETRIES}")
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            await response.aclose()
+            logger.warning(f"{method} {url} returned {response.status_code}, retry {attempt + 1}/{MAX_RETRIES}")
+        await asyncio.sleep(_backoff(attempt))
+
+
+async def _get_json(url, **kwargs):
+    response = await _send("GET", url, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+
+def get_json(url, **kwargs):
+    """GET a JSON document through the shared client."""
+    return _run(_get_json(url, **kwargs))
+
+
+def _b64_hex(value):
+    try:
+        return base64.b64decode(value, validate=True).hex()
+    except ValueError:
+        return None
+
+
+def _expected_digests(headers):
+    """
+    Digests of the whole body the origin vouches for.
+
+    Returns:
+        Dictionary {'md5': Optional[str], 'sha256': Optional[str]} of hex digests, from
+        Content-MD5, a full-object x-amz-checksum-sha256 (composite multipart checksums
+        end in "-<parts>" and are skipped) and, with ETAG_IS_MD5, the ETag.
+    """
+    digests = {'md5': None, 'sha256': None}
+    if headers.get('content-md5'):
+        digests['md5'] = _b64_hex(headers['content-md5'])
+    checksum = headers.get('x-amz-checksum-sha256', '')
+    if checksum and '-' not in checksum:
+        digests['sha256'] = _b64_hex(checksum)
+    if digests['md5'] is None and ETAG_IS_MD5:
+        etag = headers.get('etag', '').strip('"')
+        if len(etag) == 32 and all(c in '0123456789abcdef' for c in etag.lower()):
+            digests['md5'] = etag.lower()
+    return digests
+
+
+async def _stream_to_file(url, file_path, headers, chunk_size):
+    part_path = file_path + ".part"
+    sha256, md5 = hashlib.sha256(), hashlib.md5()
+    written = 0
+    total = None
+    first_headers = None
+    started = time.monotonic()
+    not_modified = None
+
+    try:
+        with open(part_path, "wb") as file:
+            for attempt in range(MAX_RETRIES + 1):
+                # Identity encoding keeps byte counts comparable with Content-Length / ranges
+                request_headers = dict(headers, **{'Accept-Encoding': 'identity'})
+                if written:
+                    # Resume after an interrupted body; If-Range restarts from 0 if the report changed
+                    request_headers.pop('If-None-Match', None)
+                    request_headers.pop('If-Modified-Since', None)
+                    request_headers['Range'] = f"bytes={written}-"
+                    if first_headers.get('etag'):
+                        request_headers['If-Range'] = first_headers['etag']
+                response = await _send("GET", url, stream=True, headers=request_headers)
+                try:
+                    if response.status_code == 304:
+                        not_modified = dict(response.headers)
+                        break
+                    response.raise_for_status()
+
+                    if response.status_code != 206 and written:
+                        # Origin ignored the range, start over
+                        logger.warning(f"{url} does not support resume, restarting download")
+                        file.seek(0)
+                        file.truncate()
+                        sha256, md5 = hashlib.sha256(), hashlib.md5()
+                        written = 0
+                    if first_headers is None or response.status_code != 206:
+                        first_headers = dict(response.headers)
+                        length = response.headers.get('content-length')
+                        total = int(length) if length is not None else None
+                    else:
+                        content_range = response.headers.get('content-range', '')
+                        if '/' in content_range and not content_range.endswith('/*'):
+                            total = int(content_range.rsplit('/', 1)[1])
+
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        file.write(chunk)
+                        sha256.update(chunk)
+                        md5.update(chunk)
+                        written += len(chunk)
+                    break
+                except (httpx.ReadError, httpx.ReadTimeout, httpx.RemoteProtocolError) as e:
+                    if attempt == MAX_RETRIES:
+                        raise
+                    logger.warning(f"Download of {url} interrupted at {written} bytes ({e!r}), resuming")
+                    await asyncio.sleep(_backoff(attempt))
+                finally:
+                    await response.aclose()
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+    if not_modified is not None:
+        os.remove(part_path)
+        return {'status': 304, 'headers': not_modified, 'hash': None, 'bytes': 0, 'throughput': None}
+
+    if total is not None and written != total:
+        os.remove(part_path)
+        raise IOError(f"Incomplete download of {url}: got {written} of {total} bytes")
+    expected = _expected_digests({key.lower(): value for key, value in first_headers.items()})
+    if (expected['md5'] and md5.hexdigest() != expected['md5']) or \
+            (expected['sha256'] and sha256.hexdigest() != expected['sha256']):
+        os.remove(part_path)
+        raise IOError(f"Checksum mismatch for {url}")
+    os.replace(part_path, file_path)
+
+    elapsed = max(time.monotonic() - started, 1e-6)
+    throughput = written / elapsed
+    logger.info(f"Downloaded {written / 1e6:.2f} MB from {url} in {elapsed:.2f} s "
+                f"({throughput / 1e6:.2f} MB/s, chunk {chunk_size} B)")
+    return {'status': 200, 'headers': first_headers, 'hash': sha256.hexdigest(),
+            'bytes': written, 'throughput': throughput}
+
+
+def stream_to_file(url, file_path, headers=None, chunk_size=8192):
+    """
+    Stream a GET response body into file_path through the shared client.
+
+    The body goes to a .part file first. An interrupted transfer is resumed with a
+    Range request, the result is checked against Content-Length and the checksums the
+    origin sends (Content-MD5, x-amz-checksum-sha256, the ETag only with ETAG_IS_MD5)
+    and only then renamed into place.
+
+    Returns:
+        Dictionary {'status': int, 'headers': Dict[str, str], 'hash': Optional[str],
+                    'bytes': int, 'throughput': Optional[float]}  # bytes per second
+        Nothing is written on a 304. Other non-2xx statuses raise httpx.HTTPStatusError,
+        incomplete or corrupt bodies raise IOError.
+    """
+    return _run(_stream_to_file(url, file_path, headers or {}, chunk_size))
@@ -0,0 +1,134 @@
+import os
+import time
+import logging
+import threading
+
+# Process-wide memory budget for everything the app keeps between reruns.
+# Caches register a pool: a function listing their items with size, last access and the
+# sessions holding them, plus a function dropping one item. enforce() evicts across all
+# pools until the total fits MEMORY_BUDGET_MB: items no active session holds go first,
+# then least recently used. Every evicted item can be rebuilt (datasets reload from the
+# report store, pages and orderings are recomputed), so eviction only costs time.
+MEMORY_BUDGET_MB = int(os.getenv('MEMORY_BUDGET_MB', 1536))
+# Per-session artifacts of sessions idle this long are no longer counted
+SESSION_IDLE_SECONDS = int(os.getenv('SESSION_IDLE_SECONDS', 1800))
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pools = {}          # name -> {'items': callable, 'evict': callable}
+_touched = {}        # (pool, key) -> last access, for pools that cannot track it themselves
+_session_bytes = {}  # session_id -> {label: (bytes, recorded_at)} for per-session artifacts (e.g. chat_result)
+_stats = {"evictions": 0, "evicted_bytes": 0}
+
+
+def register_pool(name, items, evict):
+    """
+    Put a cache under the budget.
+
+    Args:
+        name: Pool name shown in usage().
+        items: Zero-argument callable returning a list of
+               {'key': Hashable, 'bytes': int, 'last_access': float, 'sessions': List[str]}.
+        evict: Callable dropping the item with the given key.
+    """
+    with _lock:
+        _pools[name] = {'items': items, 'evict': evict}
+
+
+def touch(pool, key):
+    _touched[(pool, key)] = time.time()
+
+
+def last_touched(pool, key):
+    return _touched.get((pool, key), 0.0)
+
+
+def record_session(session_id, label, nbytes):
+    """Account a per-session artifact, e.g. the last chat answer kept in session_state."""
+    now = time.time()
+    with _lock:
+        _session_bytes.setdefault(session_id, {})[label] = (int(nbytes), now)
+        for stale in [sid for sid, artifacts in _session_bytes.items()
+                      if all(now - recorded_at > SESSION_IDLE_SECONDS for _, recorded_at in artifacts.values())]:
+            del _session_bytes[stale]
+
+
+def cache_data_bytes(func_name):
+    """Bytes st.cache_data holds for a function, 0 when Streamlit does not expose its cache stats."""
+    try:
+        from streamlit.runtime.caching import get_data_cache_stats_provider
+        cache_stats = get_data_cache_stats_provider().get_stats()
+    except Exception:
+        return 0
+    return sum(stat.byte_length for stat in cache_stats if stat.cache_name.split('.')[-1] == func_name)
+
+
+def _collect():
+    collected = []
+    for name, pool in list(_pools.items()):
+        try:
+            for item in pool['items']():
+                collected.append((name, item))
+        except Exception as e:
+            logger.warning(f"Memory pool {name} could not report its items: {e}")
+    return collected
+
+
+def enforce(budget_mb=None):
+    """Evict across all pools until their total fits the budget."""
+    budget = (MEMORY_BUDGET_MB if budget_mb is None else budget_mb) * 1024 * 1024
+    with _lock:
+        collected = _collect()
+        total = sum(item['bytes'] for _, item in collected)
+        if total <= budget:
+            return
+        collected.sort(key=lambda entry: (bool(entry[1]['sessions']), entry[1]['last_access']))
+        for name, item in collected:
+            if total <= budget:
+                break
+            try:
+                _pools[name]['evict'](item['key'])
+            except Exception as e:
+                logger.warning(f"Memory pool {name} could not evict {item['key']}: {e}")
+                continue
+            _touched.pop((name, item['key']), None)
+            total -= item['bytes']
+            _stats["evictions"] += 1
+            _stats["evicted_bytes"] += item['bytes']
+            logger.info(f"Memory budget: evicted {name}/{item['key']} ({item['bytes'] / 1e6:.1f} MB)")
+
+
+def usage():
+    """
+    Current memory accounting, for the diagnostics panel.
+
+    Returns:
+        Dictionary:
+        {
+            'budget_bytes': int,
+            'total_bytes': int,
+            'pools': Dict[str, {'items': int, 'bytes': int}],
+            'sessions': Dict[str, int],   # bytes of items each session holds plus its own artifacts
+            'evictions': int,
+            'evicted_bytes': int
+        }
+    """
+    with _lock:
+        collected = _collect()
+        pools = {name: {'items': 0, 'bytes': 0} for name in _pools}
+        sessions = {}
+        for name, item in collected:
+            pools[name]['items'] += 1
+            pools[name]['bytes'] += item['bytes']
+            for session_id in item['sessions']:
+                sessions[session_id] = sessions.get(session_id, 0) + item['bytes']
+        for session_id, artifacts in _session_bytes.items():
+            sessions[session_id] = sessions.get(session_id, 0) + sum(nbytes for nbytes, _ in artifacts.values())
+        return dict(
+            _stats,
+            budget_bytes=MEMORY_BUDGET_MB * 1024 * 1024,
+            total_bytes=sum(pool['bytes'] for pool in pools.values()),
+            pools=pools,
+            sessions=sessions,
+        )
@@ -0,0 +1,115 @@
+import time
+import threading
+import numpy as np
+import pandas as pd
+import memory_governor
+
+# Order-level view of line-item reports (Order Sales Summary, 3rd Party Sales Summary).
+# Built once per report version: one row per Order ID (its first line, as
+# drop_duplicates(subset=['Order ID']) keeps) plus, for every line, the position of its
+# order in that table. Charts ask for it with the frame they were given; frames that
+# are not the full report (filtered, reordered) fall back to computing it directly.
+ORDER_ID = "Order ID"
+REPORT_KEY_ATTR = "report_key"
+
+_lock = threading.Lock()
+_entries = {}   # report_key -> {'orders', 'line_order', 'index', 'item_counts', 'bytes', 'last_access'}
+
+
+def build(report_key, df):
+    """
+    Build and cache the order table of a report.
+
+    Args:
+        report_key: Shared-cache key of the report version.
+        df: Full line-item frame, as the charts receive it.
+
+    Returns:
+        Dictionary {'orders': DataFrame, 'line_order': np.ndarray, 'index': Index,
+                    'item_counts': Dict[str, Series], 'bytes': int, 'last_access': float}
+        or None when the frame has no Order ID column.
+    """
+    if ORDER_ID not in df.columns:
+        return None
+    # NaN Order IDs form one order, as they do for drop_duplicates
+    line_order, _ = pd.factorize(df[ORDER_ID], use_na_sentinel=False)
+    # factorize numbers orders by first appearance, so the first line of each is in order
+    _, first_lines = np.unique(line_order, return_index=True)
+    orders = df.iloc[first_lines]
+    entry = {
+        'orders': orders,
+        'line_order': line_order,
+        'index': df.index,
+        'item_counts': {},
+        'bytes': int(orders.memory_usage(index=True, deep=True).sum()) + int(line_order.nbytes),
+        'last_access': time.time(),
+    }
+    with _lock:
+        _entries[report_key] = entry
+    memory_governor.enforce()
+    return entry
+
+
+def has(report_key):
+    with _lock:
+        return report_key in _entries
+
+
+def _entry_for(data, order_id_col):
+    if order_id_col != ORDER_ID:
+        return None
+    report_key = data.attrs.get(REPORT_KEY_ATTR)
+    if report_key is None:
+        return None
+    with _lock:
+        entry = _entries.get(report_key)
+    if entry is None or len(entry['line_order']) != len(data) or not data.index.equals(entry['index']):
+        return None
+    entry['last_access'] = time.time()
+    return entry
+
+
+def orders(data, order_id_col=ORDER_ID):
+    """One row per order: the cached table for a full report frame, drop_duplicates otherwise."""
+    entry = _entry_for(data, order_id_col)
+    if entry is None:
+        return data.drop_duplicates(subset=[order_id_col])
+    return entry['orders'].copy(deep=False)
+
+
+def orders_per_item(data, item_col, order_id_col=ORDER_ID):
+    """
+    Number of distinct orders per item value, like
+    data.drop_duplicates(subset=[order_id_col, item_col]).groupby(item_col, observed=True).size().
+
+    Returns:
+        Series indexed by item value in groupby order.
+    """
+    entry = _entry_for(data, order_id_col)
+    if entry is None:
+        return data.drop_duplicates(subset=[order_id_col, item_col]).groupby(item_col, observed=True).size()
+    counts = entry['item_counts'].get(item_col)
+    if counts is None:
+        item_codes, items = pd.factorize(data[item_col])
+        valid = item_codes >= 0
+        n_orders = len(entry['orders'])
+        pairs = np.unique(item_codes[valid].astype(np.int64) * n_orders + entry['line_order'][valid])
+        counts = pd.Series(np.bincount(pairs // n_orders, minlength=len(items)),
+                           index=pd.Index(items, name=item_col)).sort_index()
+        with _lock:
+            entry['item_counts'][item_col] = counts
+    return counts.copy()
+
+
+def _items():
+    with _lock:
+        return [{'key': key, 'bytes': entry['bytes'], 'last_access': entry['last_access'], 'sessions': []}
+                for key, entry in _entries.items()]
+
+
+def evict(report_key):
+    with _lock:
+        _entries.pop(report_key, None)
+
+
+memory_governor.register_pool("order_index", _items, evict)
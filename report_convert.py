@@ -0,0 +1,235 @@
+import os
+import time
+import logging
+import threading
+import _thread
+import multiprocessing
+import pandas as pd
+import report_io
+
+# Workbook conversion runs in worker processes, at most CONVERT_WORKERS at once, so one
+# slow or oversized file cannot block the session thread and concurrent sessions
+# convert on separate cores.
+CONVERT_WORKERS = int(os.getenv('CONVERT_WORKERS', max(1, min(4, (os.cpu_count() or 2) - 1))))
+CONVERT_TIMEOUT = float(os.getenv('CONVERT_TIMEOUT', 120))
+CONVERT_MAX_RSS_MB = int(os.getenv('CONVERT_MAX_RSS_MB', 2048))
+# Extra seconds a worker gets to unwind after being interrupted before it is killed
+KILL_GRACE = 5
+
+logger = logging.getLogger(__name__)
+
+# Conversions running at once in this server process; waiting for a slot does not
+# count against a job's limits
+_slots = threading.BoundedSemaphore(CONVERT_WORKERS)
+_slots_lock = threading.Lock()
+_mp_context = None
+
+
+# Line breaks inside cells break the table display, they become plain spaces
+_LINE_BREAKS = str.maketrans({'\n': ' ', '\r': ' '})
+
+
+def sanitize_text_columns(df):
+    """
+    Replace line breaks in text cells with spaces.
+
+    Only object/string columns are scanned; a column is rewritten only in the rows that
+    actually contain a line break, with one str.translate pass for both characters.
+    Equivalent to df.replace(r'\n', ' ', regex=True).replace(r'\r', ' ', regex=True).
+    """
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        values = df[col]
+        try:
+            has_break = values.str.contains('[\r\n]', regex=True, na=False)
+        except AttributeError:
+            # Object column without any text (e.g. only dates), nothing to clean
+            continue
+        if has_break.any():
+            df.loc[has_break, col] = values[has_break].str.translate(_LINE_BREAKS)
+    return df
+
+
+def convert_excel_to_csv(excel_file_path, output_format="parquet"):
+    """
+    Convert a downloaded workbook into the stored dataset format.
+
+    Args:
+        excel_file_path: Path to the .xlsx file, removed after conversion.
+        output_format: "parquet" (default, typed and column-loadable) or "csv" for export.
+
+    Returns:
+        Path of the converted file, None on failure.
+    """
+    try:
+        #print(f"Converting file: {excel_file_path}")
+        
+        # 1. Attempt with Calamine (Highly resilient to malformed .xlsx files)
+        try:
+            df = pd.read_excel(excel_file_path, engine='calamine')
+            #print("Successfully read using calamine engine.")
+            
+        except ImportError:
+            #print("Calamine not installed. Trying default pandas reader...")
+            try:
+                df = pd.read_excel(excel_file_path)
+            except ValueError as e:
+                if "NaN" in str(e):
+                    #print("openpyxl hit the NaN bug. Trying as disguised CSV...")
+                    # Sometimes systems output CSVs but name them .xlsx
+                    df = pd.read_csv(excel_file_path)
+                else:
+                    raise e
+                    
+        # 2. Clean the data for Streamlit/Gradio compatibility
+        df.columns = df.columns.astype(str).str.strip()
+        df = sanitize_text_columns(df)
+        
+        # 3. Save as Parquet (typed columns) or CSV when exporting
+        dataset_file_path = report_io.dataset_path_for(excel_file_path, output_format)
+        if output_format != "csv":
+            df = report_io.normalize_for_parquet(df)
+        report_io.write_dataset(df, dataset_file_path)
+        
+        # 4. Clean up original file
+        if os.path.exists(excel_file_path):
+            os.remove(excel_file_path)
+            
+        return dataset_file_path
+        
+    except Exception as e:
+        logger.error(f"Critical failure during conversion: {str(e)}")
+        return None
+
+
+def _rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+# Exit codes of a worker its watchdog had to kill
+TIMEOUT_EXIT = 3
+MEMORY_EXIT = 4
+
+
+def _watchdog(state, timeout, max_rss_mb, done):
+    """Interrupt the conversion when it runs too long or grows too big; kill the worker if it does not stop."""
+    started = time.monotonic()
+    while not done.wait(0.2):
+        if state['reason'] is None:
+            if time.monotonic() - started > timeout:
+                state['reason'] = 'timeout'
+            elif max_rss_mb and _rss_mb() > max_rss_mb:
+                state['reason'] = 'memory'
+            if state['reason'] is not None:
+                state['interrupted_at'] = time.monotonic()
+                _thread.interrupt_main()
+        elif time.monotonic() - state['interrupted_at'] > KILL_GRACE:
+            # Stuck in native code: end the worker, it only ever runs this one job
+            os._exit(MEMORY_EXIT if state['reason'] == 'memory' else TIMEOUT_EXIT)
+
+
+def _limit_message(reason, timeout, max_rss_mb):
+    if reason == 'memory':
+        return f"Conversion exceeded {max_rss_mb} MB of memory"
+    return f"Conversion did not finish within {timeout:.0f} s"
+
+
+def _convert_job(excel_file_path, output_format, timeout, max_rss_mb):
+    state = {'reason': None, 'interrupted_at': None}
+    done = threading.Event()
+    watchdog = threading.Thread(target=_watchdog, args=(state, timeout, max_rss_mb, done), daemon=True)
+    watchdog.start()
+    try:
+        path = convert_excel_to_csv(excel_file_path, output_format)
+        if path is None:
+            return {'path': None, 'error': 'Conversion failed', 'reason': 'failed'}
+        return {'path': path, 'error': None, 'reason': None}
+    except KeyboardInterrupt:
+        reason = state['reason'] or 'timeout'
+        return {'path': None, 'error': _limit_message(reason, timeout, max_rss_mb), 'reason': reason}
+    finally:
+        done.set()
+
+
+def _worker(conn, excel_file_path, output_format, timeout, max_rss_mb):
+    try:
+        conn.send(_convert_job(excel_file_path, output_format, timeout, max_rss_mb))
+    finally:
+        conn.close()
+
+
+def _context():
+    global _mp_context
+    with _slots_lock:
+        if _mp_context is None:
+            # forkserver/spawn: forking the multi-threaded Streamlit server is not safe.
+            # The fork server preloads pandas once, so each job starts in milliseconds.
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                _mp_context = multiprocessing.get_context('forkserver')
+                _mp_context.set_forkserver_preload(['report_convert'])
+            else:
+                _mp_context = multiprocessing.get_context('spawn')
+        return _mp_context
+
+
+def convert_in_pool(excel_file_path, output_format="parquet",
+                    timeout=None, max_rss_mb=None):
+    """
+    Convert a workbook in a worker process, at most CONVERT_WORKERS at a time.
+
+    Every job gets its own process, so a worker killed for a limit never affects
+    another session's conversion. The limits count from when the job starts, not
+    while it waits for a free slot.
+
+    Args:
+        excel_file_path: Path to the downloaded workbook.
+        output_format: Passed to convert_excel_to_csv.
+        timeout: Wall-clock limit in seconds, defaults to CONVERT_TIMEOUT.
+        max_rss_mb: Resident memory limit of the worker, defaults to CONVERT_MAX_RSS_MB.
+
+    Returns:
+        Dictionary:
+        {
+            'path': Optional[str],     # converted file on success
+            'error': Optional[str],    # message that can be shown to the user
+            'reason': Optional[str]    # 'timeout', 'memory', 'failed' or 'crashed'
+        }
+    """
+    timeout = CONVERT_TIMEOUT if timeout is None else timeout
+    max_rss_mb = CONVERT_MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+    ctx = _context()
+    with _slots:
+        reader, writer = ctx.Pipe(duplex=False)
+        process = ctx.Process(target=_worker, args=(writer, excel_file_path, output_format, timeout, max_rss_mb),
+                              name="report-convert", daemon=True)
+        process.start()
+        writer.close()
+        result = None
+        try:
+            # The watchdog in the worker enforces the limits; this only covers a worker
+            # that could not even run it
+            if reader.poll(timeout + 2 * KILL_GRACE):
+                result = reader.recv()
+        except (EOFError, OSError):
+            pass
+        finally:
+            reader.close()
+        if result is None and process.is_alive():
+            process.kill()
+        process.join()
+
+    if result is None:
+        if process.exitcode == TIMEOUT_EXIT:
+            result = {'path': None, 'error': _limit_message('timeout', timeout, max_rss_mb), 'reason': 'timeout'}
+        elif process.exitcode == MEMORY_EXIT:
+            result = {'path': None, 'error': _limit_message('memory', timeout, max_rss_mb), 'reason': 'memory'}
+        else:
+            result = {'path': None, 'error': "Conversion worker stopped unexpectedly", 'reason': 'crashed'}
+
+    if result['error']:
+        logger.error(f"Conversion of {excel_file_path} failed: {result}")
+    return result
@@ -0,0 +1,57 @@
+import os
+import logging
+import http_client
+
+# Seconds a stored report is served without asking the origin again.
+# After that a conditional request (If-None-Match / If-Modified-Since) is sent.
+REPORT_MAX_AGE = int(os.getenv('REPORT_MAX_AGE', 300))
+# Bytes read per chunk while streaming a report to disk
+DOWNLOAD_CHUNK_SIZE = int(os.getenv('DOWNLOAD_CHUNK_SIZE', 64 * 1024))
+
+logger = logging.getLogger(__name__)
+
+
+def download_report(url, file_path, etag=None, last_modified=None, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """
+    Stream a report to file_path, revalidating against a cached copy when validators are given.
+
+    Args:
+        url: Report link.
+        file_path: Where the body is written on a 200.
+        etag: ETag of the cached copy, sent as If-None-Match.
+        last_modified: Last-Modified of the cached copy, sent as If-Modified-Since.
+        chunk_size: Streaming chunk size in bytes.
+
+    Returns:
+        Dictionary:
+        {
+            'not_modified': bool,        # True on 304, nothing was written
+            'hash': Optional[str],       # sha256 of the body
+            'etag': Optional[str],
+            'last_modified': Optional[str],
+            'throughput': Optional[float] # bytes per second, only on a full download
+        }
+    """
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    response = http_client.stream_to_file(url, file_path, headers=headers, chunk_size=chunk_size)
+    if response['status'] == 304:
+        logger.info(f"Report not modified, skipping body: {url}")
+        return {
+            'not_modified': True,
+            'hash': None,
+            'etag': response['headers'].get('etag', etag),
+            'last_modified': response['headers'].get('last-modified', last_modified)
+        }
+
+    return {
+        'not_modified': False,
+        'hash': response['hash'],
+        'etag': response['headers'].get('etag'),
+        'last_modified': response['headers'].get('last-modified'),
+        'throughput': response['throughput']
+    }
@@ -0,0 +1,102 @@
+import os
+import pandas as pd
+
+# Converted reports are stored as Parquet: typed columns survive the round trip
+# and single columns can be loaded without parsing the whole file.
+# CSV is kept as an export format only.
+DATASET_EXT = ".parquet"
+CSV_EXT = ".csv"
+
+
+def normalize_for_parquet(df):
+    """
+    Make a freshly parsed workbook storable as Parquet while keeping the column types
+    the old CSV round trip produced.
+
+    Object columns that are entirely numeric (numbers or numeric text) become numeric,
+    as pd.read_csv would infer them; any other mixed column becomes plain strings.
+
+    Args:
+        df: DataFrame read from the workbook.
+
+    Returns:
+        The same DataFrame with unique string column names and Arrow-compatible columns.
+    """
+    # Parquet needs unique column names, mangle duplicates the way read_csv does
+    seen = {}
+    columns = []
+    for col in df.columns.astype(str):
+        if col in seen:
+            seen[col] += 1
+            columns.append(f"{col}.{seen[col]}")
+        else:
+            seen[col] = 0
+            columns.append(col)
+    df.columns = columns
+
+    for col in df.select_dtypes(include='object').columns:
+        try:
+            df[col] = pd.to_numeric(df[col])
+        except (ValueError, TypeError):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def write_dataset(df, path):
+    """Write a DataFrame in the format given by the path extension."""
+    if path.endswith(CSV_EXT):
+        df.to_csv(path, index=False, encoding='utf-8')
+    else:
+        df.to_parquet(path, index=False)
+    return path
+
+
+def read_dataset(path, columns=None):
+    """
+    Load a stored report.
+
+    Args:
+        path: Parquet (or legacy CSV) file.
+        columns: Optional list of columns to load; Parquet reads only those.
+
+    Returns:
+        Pandas DataFrame.
+    """
+    if path.endswith(CSV_EXT):
+        return pd.read_csv(path, usecols=columns, low_memory=False)
+    return pd.read_parquet(path, columns=columns)
+
+
+def read_columns(path):
+    """Return the column names of a stored report without loading its data."""
+    if path.endswith(CSV_EXT):
+        return pd.read_csv(path, nrows=0).columns.tolist()
+    import pyarrow.parquet as pq
+    return pq.read_schema(path).names
+
+
+def read_sample(path, nrows):
+    """
+    Return the header plus at most nrows leading rows of a stored report.
+
+    Parquet is read batch by batch so only the first batch is decoded,
+    CSV is read with nrows; both cost the same regardless of file size.
+    """
+    if path.endswith(CSV_EXT):
+        return pd.read_csv(path, nrows=nrows, low_memory=False)
+    import pyarrow.parquet as pq
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=nrows):
+        return batch.to_pandas()
+    return parquet_file.schema_arrow.empty_table().to_pandas()
+
+
+def export_csv(path):
+    """Return a stored report as UTF-8 CSV bytes, for download buttons."""
+    return read_dataset(path).to_csv(index=False).encode('utf-8')
+
+
+def dataset_path_for(source_path, output_format="parquet"):
+    """Path of the converted dataset next to its source workbook."""
+    ext = CSV_EXT if output_format == "csv" else DATASET_EXT
+    return os.path.splitext(source_path)[0] + ext
@@ -0,0 +1,101 @@
+import logging
+import numpy as np
+import pandas as pd
+from report_schema import get_schema, MONEY, DURATION
+
+# Shared preprocessing for the report visualizations, replacing the per-module
+# preprocess_data copies. Each report lists the steps it needs in report_registry;
+# the result is built once per report version and cached next to the raw frame.
+PARSE_CURRENCY = "parse_currency"   # money columns still holding text like "$1,234.50" become numbers
+PARSE_DURATIONS = "parse_durations"  # duration columns like "8h 30m" become float hours
+FILL_NUMERIC = "fill_numeric"       # numeric columns: missing values -> 0, dtype float64
+
+STANDARD_STEPS = (PARSE_CURRENCY, PARSE_DURATIONS, FILL_NUMERIC)
+
+# "Xh Ym" or "Ym" at the start of the value, anything else counts as 0 hours
+DURATION_PATTERN = r'^(?:(\d+)h\s*(\d+)m|(\d+)m)'
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_currency(df, report_type, changes):
+    schema = get_schema(report_type)
+    if schema is None:
+        return
+    for col, dtype in schema['dtypes'].items():
+        if dtype != MONEY or col not in df.columns:
+            continue
+        # Text may come as object or as a string dtype (the pandas 3 default)
+        if not (pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])):
+            continue
+        text = df[col].astype(str).str.replace(r'[$,\s]', '', regex=True)
+        parsed = pd.to_numeric(text, errors='coerce')
+        unparsed = int((parsed.isna() & df[col].notna()).sum())
+        df[col] = parsed
+        changes.append(f"{col}: parsed currency text" + (f", {unparsed} unparseable values set to NaN" if unparsed else ""))
+
+
+def parse_hours(values):
+    """
+    Convert "Xh Ym" durations to float hours.
+
+    Each distinct value is matched once. Missing or unmatched values give 0.
+
+    Returns:
+        float64 Series with the index of values.
+    """
+    codes, uniques = pd.factorize(values)
+    parts = pd.Series(uniques, dtype=object).astype(str).str.extract(DURATION_PATTERN)
+    hours = parts[0].astype(float).fillna(0)
+    minutes = parts[1].astype(float).fillna(parts[2].astype(float)).fillna(0)
+    # Missing values have code -1 and pick the trailing 0
+    unique_hours = np.append((hours + minutes / 60).to_numpy(dtype=np.float64), 0.0)
+    return pd.Series(unique_hours[codes], index=values.index, name=values.name)
+
+
+def _parse_durations(df, report_type, changes):
+    schema = get_schema(report_type)
+    if schema is None:
+        return
+    for col, dtype in schema['dtypes'].items():
+        if dtype != DURATION or col not in df.columns or pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        df[col] = parse_hours(df[col])
+        changes.append(f"{col}: parsed durations to hours")
+
+
+def _fill_numeric(df, changes):
+    for col in df.select_dtypes(include=np.number).columns:
+        missing = int(df[col].isna().sum())
+        if missing:
+            df[col] = df[col].fillna(0)
+            changes.append(f"{col}: {missing} missing values filled with 0")
+        if df[col].dtype != np.float64:
+            df[col] = df[col].astype(float)
+
+
+def preprocess(df, report_type, steps=STANDARD_STEPS):
+    """
+    Clean a report frame for the visualizations.
+
+    Args:
+        df: Report DataFrame, modified in place.
+        report_type: Registry key, selects the money and duration columns.
+        steps: Steps to run, in order (PARSE_CURRENCY, PARSE_DURATIONS, FILL_NUMERIC).
+
+    Returns:
+        The cleaned DataFrame.
+    """
+    changes = []
+    for step in steps:
+        if step == PARSE_CURRENCY:
+            _parse_currency(df, report_type, changes)
+        elif step == PARSE_DURATIONS:
+            _parse_durations(df, report_type, changes)
+        elif step == FILL_NUMERIC:
+            _fill_numeric(df, changes)
+        else:
+            raise ValueError(f"Unknown preprocessing step: {step}")
+    if changes:
+        logger.info(f"[{report_type}] preprocessing: " + "; ".join(changes))
+    return df
@@ -0,0 +1,177 @@
+import importlib
+from report_schema import get_schema
+from report_preprocess import STANDARD_STEPS
+
+# Declarative registry of the supported reports.
+# Each entry holds what the app needs to show a report: its titles, the base name its
+# files are stored under, the module providing report_func, the report_preprocess
+# steps its charts expect and whether its charts use the order_index table. Report modules (and the
+# visualization modules they pull in) are imported only when that report is opened.
+# Adding a report means adding an entry here and its columns to report_schema.
+
+REPORTS = {
+    "THIRD_PARTY_SALES_SUMMARY": {
+        "title": "3rd Party Sales Summary",
+        "display_name": "3rd Party Sales Summary report",
+        "file_name": "third_party_sales_summary",
+        "module": "reports_type.third_party_sales_summary",
+        "preprocess": STANDARD_STEPS,
+        "order_index": True,
+    },
+    "ORDER_SALES_SUMMARY": {
+        "title": "Order Sales Summary",
+        "display_name": "Order Sales Summary report",
+        "file_name": "order_sales_summary",
+        "module": "reports_type.order_sales_summary",
+        "preprocess": STANDARD_STEPS,
+        "order_index": True,
+    },
+    "BEST_SELLERS": {
+        "title": "Best Sellers",
+        "display_name": "Best Sellers report",
+        "file_name": "best_sellers",
+        "module": "reports_type.best_sellers",
+        "preprocess": STANDARD_STEPS,
+    },
+    "REP_DETAILS": {
+        "title": "Representative Details",
+        "display_name": "Representative Details report",
+        "file_name": "rep_details",
+        "module": "reports_type.rep_details",
+        "preprocess": STANDARD_STEPS,
+    },
+    "REPS_SUMMARY": {
+        "title": "Reps Summary",
+        "display_name": "Reps Summary report",
+        "file_name": "reps_summary",
+        "module": "reports_type.reps_summary",
+        "preprocess": STANDARD_STEPS,
+    },
+    "SKU_NOT_ORDERED": {
+        "title": "SKU's Not Ordered",
+        "display_name": "SKU's Not Ordered report",
+        "file_name": "sku_not_ordered",
+        "module": "reports_type.sku_not_ordered",
+        "preprocess": STANDARD_STEPS,
+    },
+    "LOW_STOCK_INVENTORY": {
+        "title": "Low Stock Inventory",
+        "display_name": "Low Stock Inventory report",
+        "file_name": "low_stock_inventory",
+        "module": "reports_type.low_stock_inventory",
+        "preprocess": STANDARD_STEPS,
+    },
+    "CURRENT_INVENTORY": {
+        "title": "Current Inventory",
+        "display_name": "Current Inventory report",
+        "file_name": "current_inventory",
+        "module": "reports_type.current_inventory",
+        "preprocess": STANDARD_STEPS,
+    },
+    "TOP_CUSTOMERS": {
+        "title": "Top Customers",
+        "display_name": "Top Customers report",
+        "file_name": "top_customers",
+        "module": "reports_type.top_customers",
+        "preprocess": STANDARD_STEPS,
+    },
+    "CUSTOMER_DETAILS": {
+        "title": "Customer Details",
+        "display_name": "Customer Details report",
+        "file_name": "customer_details",
+        "module": "reports_type.customer_details",
+        "preprocess": STANDARD_STEPS,
+    },
+    "INVENTORY_DEPLETION": {
+        "title": "Inventory depletion",
+        "display_name": "Inventory Depletion report",
+        "file_name": "inventory_depletion",
+        "module": "reports_type.inventory_depletion",
+        "preprocess": STANDARD_STEPS,
+    },
+    "REPS_VISITS": {
+        "title": "Reps Visits",
+        "display_name": "Reps visits report",
+        "file_name": "reps_visits",
+        "module": "reports_type.reps_visits",
+        "preprocess": STANDARD_STEPS,
+    },
+    "PRODUCT_FULFILLMENT": {
+        "title": "Product fulfillment",
+        "display_name": "Product fulfillment report",
+        "file_name": "product_fulfillment",
+        "module": "reports_type.product_fulfillment",
+        "preprocess": STANDARD_STEPS,
+    },
+    "PAYMENTS": {
+        "title": "Payments",
+        "display_name": "Payments report",
+        "file_name": "payments",
+        "module": "reports_type.payments",
+        "preprocess": STANDARD_STEPS,
+    },
+}
+
+DEFAULT_TITLE = "SimplyDepo"
+DEFAULT_DISPLAY_NAME = "SimplyDepo report"
+DEFAULT_FILE_NAME = "unknown"
+
+_by_display_name = {entry["display_name"]: key for key, entry in REPORTS.items()}
+_by_file_name = {entry["file_name"]: key for key, entry in REPORTS.items()}
+
+
+def get(report_key):
+    """Registry entry for a report key, None for unknown reports."""
+    return REPORTS.get(report_key)
+
+
+def key_for_display_name(display_name):
+    return _by_display_name.get(display_name)
+
+
+def key_for_file_name(file_name):
+    """Report key for a stored file's base name (without extension), None if unknown."""
+    return _by_file_name.get(file_name)
+
+
+def title(report_key):
+    entry = REPORTS.get(report_key)
+    return entry["title"] if entry else DEFAULT_TITLE
+
+
+def display_name(report_key):
+    entry = REPORTS.get(report_key)
+    return entry["display_name"] if entry else DEFAULT_DISPLAY_NAME
+
+
+def file_name(report_key, ext=".xlsx"):
+    entry = REPORTS.get(report_key)
+    return (entry["file_name"] if entry else DEFAULT_FILE_NAME) + ext
+
+
+def schema(report_key):
+    """Expected columns and dtypes of a report, see report_schema.get_schema."""
+    return get_schema(report_key)
+
+
+def preprocess_steps(report_key):
+    entry = REPORTS.get(report_key)
+    return entry["preprocess"] if entry else ()
+
+
+def uses_order_index(report_key):
+    entry = REPORTS.get(report_key)
+    return bool(entry and entry.get("order_index"))
+
+
+def report_func(report_key):
+    """
+    Return the report_func rendering a report's visualizations, importing its module on first use.
+
+    Returns:
+        Callable taking the report DataFrame, or None for unknown reports.
+    """
+    entry = REPORTS.get(report_key)
+    if entry is None:
+        return None
+    return importlib.import_module(entry["module"]).report_func
@@ -0,0 +1,240 @@
+import pandas as pd
+import report_io
+import date_parse
+
+# Schema registry: the expected columns of every report type plus the dtypes
+# applied when a stored report is loaded. Date columns are parsed there, once, so the
+# viz modules receive datetime64 columns.
+
+EXPECTED_COLUMNS = {
+    "PRODUCT_FULFILLMENT": [
+        "Order ID", "Customer", "Shipping Address", "Shipping City", "Shipping State",
+        "Shipping ZIP", "Delivery Status", "Type", "VIA", "Fulfilled By", "Tracking ID",
+        "Fulfill Date", "Product Name", "QTY", "Product Price", "Product Total",
+        "Payment Status", "Grand Total", "Paid", "Balance", "Contact Phone", "Contact Name"
+    ],
+    "REPS_VISITS": [
+        "Role", "ID", "Name", "Date", "Business Name", "Billing Address", "Billing City",
+        "Billing State", "Billing ZIP", "Shipping Address", "Shipping City", "Shipping State",
+        "Shipping ZIP", "Check In", "Check Out", "Total Time", "Check In Status",
+        "Cases Sold (Direct)", "Cases Sold (3rd party)", "Cases Sold Total", "Notes",
+        "Orders (Direct)", "Orders (3rd party)", "Orders Total", "Photos", "Forms Submission"
+    ],
+    "INVENTORY_DEPLETION": [
+        "Business Name", "Shipping Address", "Shipping City", "Shipping State",
+        "Shipping ZIP", "Billing Address", "Billing City", "Billing State", "Billing ZIP",
+        "Ginger Shots / Digestive Aid / 2 fl oz", "Ginger Shots / Immunity Aid / 2 fl oz",
+        "Ginger Shots / Immunity Booster / 2 fl oz", "Ginger Shots / Vitamin C / 2 fl oz"
+    ],
+    "REPS_SUMMARY": [
+        "ID", "Name", "Role", "Visits", "Orders (Direct)", "Orders (3rd party)",
+        "Orders Total", "Cases Sold (Direct)", "Cases Sold (3rd party)", "Cases Sold Total",
+        "Total Revenue (Direct)", "Total Revenue (3rd party)", "Total Revenue", "Photos",
+        "Notes", "New Clients", "Date", "Start Day", "End Day", "Break", "Travel Distance",
+        "First Visit", "Last Visit", "Total Time"
+    ],
+    "REP_DETAILS": [
+        "ID", "Name", "Role", "Email", "Phone Number", "Total Visits",
+        "Total Photos", "Total Notes", "Total Working Hours", "Total Break Hours",
+        "Total Travel Distance", "Assigned Customers", "Active Customers", "Inactive Customers"
+    ],
+    "SKU_NOT_ORDERED": [
+        "Category Name", "Product Name", "SKU", "Manufacturer Name", "Cases Sold",
+        "Total Revenue", "Wholesale Price", "Retail Price", "Available Cases (QTY)", 'On Hand Cases', 'Cost'
+    ],
+    "BEST_SELLERS": [
+        "Category Name", "Product Name", "SKU", "On Hand Cases", "Allocated Cases",
+        "Manufacturer Name", "Cases Sold", "Total Revenue", "Wholesale Price",
+        "Retail Price", "Available Cases (QTY)", 'Cost'
+    ],
+    "LOW_STOCK_INVENTORY": [
+        "Category Name", "Product Name", "SKU", "On Hand Cases", "Allocated Cases",
+        "Manufacturer Name", "Available Cases (QTY)", "Wholesale Price", "Retail Price",'Total Revenue', 'Cost'
+    ],
+    "CURRENT_INVENTORY": [
+        "Category Name", "Product Name", "SKU", "On Hand Cases", "Allocated Cases",
+        "Manufacturer Name", "Available Cases (QTY)", "Wholesale Price", "Retail Price", 'Total Revenue', 'Cost'
+    ],
+    "THIRD_PARTY_SALES_SUMMARY": [
+        "Customer ID", "Customer", "Billing Address", "Slotting", "Billing City",
+        "Billing State", "Billing ZIP", "Shipping Address", "Shipping City", "Shipping State",
+        "Shipping ZIP", "Order ID", "Created By", "Date Created", "Product Name",
+        "Manufacturer Name", "QTY", "Grand Total", "Discount Type", "Item Specific Discount",
+        "Manufacturer Specific Discount", "Total Invoice Discount", "Price List",
+        "Customer Discount", "Free Cases", "Order Tags", "Representative"
+    ],
+    "ORDER_SALES_SUMMARY": [
+        "Customer ID", "Customer", "Billing Address", "Slotting", "Billing City",
+        "Billing State", "Billing ZIP", "Shipping Address", "Shipping City", "Shipping State",
+        "Shipping ZIP", "Order ID", "Created By", "Date Created", "Product Name",
+        "Product Price", "Product Total", "Manufacturer Name", "QTY", "Discount Type",
+        "Item Specific Discount", "Customer Discount", "Manufacturer Specific Discount",
+        "Total Invoice Discount", "Price List", "Free Cases", "Balance", "Payment Status",
+        "Expected Payment Date", "Grand Total", "Paid", "Delivery Status", "Delivered",
+        "Delivery Methods", "Order Note", "Order Status", "Customer Contact",
+        "Representative", "Order Tags", 'Payment Methods', 'Fulfill By'
+    ],
+    "TOP_CUSTOMERS": [
+        "Business Name", "Shipping Address", "Shipping City", "Shipping State",
+        "Shipping ZIP", "Billing Address", "Billing City", "Billing State", "Billing ZIP",
+        "Group", "Territory", "Total Orders", "Total Sales", "Customer Specific Discount",
+        "Price List", "Primary Payment Method", "Has Order Direct", "Payment Terms",
+        "Contact Name", "Contact Role", "Contact Phone", "Contact Email", "Business Phone",
+        "Business Email", "Business Fax", "Website", "Tags", "Licenses & Certifications", 'Lead Status', 'Representatives'
+    ],
+    "CUSTOMER_DETAILS": [
+        "Business Name", "Shipping Address", "Shipping City", "Shipping State",
+        "Shipping ZIP", "Billing Address", "Billing City", "Billing State", "Billing ZIP",
+        "Group", "Territory", "Total Orders", "Total Sales", "Customer Specific Discount",
+        "Price List", "Primary Payment Method", "Has Order Direct", "Payment Terms",
+        "Contact Name", "Contact Role", "Contact Phone", "Contact Email", "Business Phone",
+        "Business Email", "Business Fax", "Website", "Tags", "Licenses & Certifications", 'Lead Status', 'Representatives'
+    ],
+    "PAYMENTS": ["Order ID", "Created By", "Date Created", "Customer ID", "Business Name", "Payment Status", "Expected Payment Date", "Type",
+                  "Payment Method", "Reference #", "Note", "Payment Date", "Payment Amount", "Processed By", "Order Balance"]
+}
+
+CATEGORY = "category"
+# float64: float32 keeps ~7 significant digits and loses cents from $131,072 up.
+# frame_compact narrows money columns only where every value survives the round trip.
+MONEY = "float64"
+DATE = "datetime"
+DATE_MIXED = "datetime_mixed"
+# "Xh Ym" text, converted to float hours by report_preprocess (the table keeps the text)
+DURATION = "duration_hours"
+
+# Columns read with a typed dtype. Categoricals are only declared for line-item reports,
+# where the same customer/product/status repeats across many rows.
+_MONEY_COLUMNS = [
+    "Grand Total", "Product Price", "Product Total", "Paid", "Balance",
+    "Item Specific Discount", "Customer Discount", "Manufacturer Specific Discount",
+    "Total Invoice Discount", "Payment Amount", "Order Balance", "Wholesale Price",
+    "Retail Price", "Total Revenue", "Total Revenue (Direct)", "Total Revenue (3rd party)",
+    "Cost", "Total Sales"
+]
+_LINE_ITEM_CATEGORIES = ["Customer", "Product Name", "Representative", "Delivery Status", "Payment Status"]
+
+COLUMN_DTYPES = {
+    "PRODUCT_FULFILLMENT": {"Fulfill Date": DATE_MIXED},
+    "REPS_VISITS": {"Date": DATE},
+    "INVENTORY_DEPLETION": {},
+    "REPS_SUMMARY": {"Date": DATE, "Total Time": DURATION},
+    "REP_DETAILS": {"Total Working Hours": DURATION, "Total Break Hours": DURATION},
+    "SKU_NOT_ORDERED": {},
+    "BEST_SELLERS": {},
+    "LOW_STOCK_INVENTORY": {},
+    "CURRENT_INVENTORY": {},
+    "THIRD_PARTY_SALES_SUMMARY": {"Date Created": DATE},
+    "ORDER_SALES_SUMMARY": {"Date Created": DATE},
+    "TOP_CUSTOMERS": {},
+    "CUSTOMER_DETAILS": {},
+    "PAYMENTS": {"Payment Status": CATEGORY},
+}
+for _report_type, _dtypes in COLUMN_DTYPES.items():
+    for _col in EXPECTED_COLUMNS[_report_type]:
+        if _col in _MONEY_COLUMNS:
+            _dtypes.setdefault(_col, MONEY)
+        elif _col in _LINE_ITEM_CATEGORIES and _report_type in (
+                "ORDER_SALES_SUMMARY", "THIRD_PARTY_SALES_SUMMARY", "PRODUCT_FULFILLMENT"):
+            _dtypes.setdefault(_col, CATEGORY)
+
+# Reports whose column set is not fixed (Inventory Depletion has one column per product),
+# these are read without usecols.
+OPEN_SCHEMAS = {"INVENTORY_DEPLETION"}
+
+
+def get_schema(report_type):
+    """
+    Return the registry entry for a report type.
+
+    Returns:
+        Dictionary {'columns': List[str], 'dtypes': Dict[str, str], 'fixed_columns': bool}
+        or None for an unknown report type.
+    """
+    if report_type not in EXPECTED_COLUMNS:
+        return None
+    return {
+        'columns': EXPECTED_COLUMNS[report_type],
+        'dtypes': COLUMN_DTYPES.get(report_type, {}),
+        'fixed_columns': report_type not in OPEN_SCHEMAS
+    }
+
+
+def apply_schema(df, report_type):
+    """
+    Coerce the columns of a loaded report to the registry dtypes.
+
+    Money columns are only cast when already numeric and categoricals only built
+    from text columns, so values the viz modules clean up themselves are left alone.
+    """
+    schema = get_schema(report_type)
+    if schema is None:
+        return df
+    for col, dtype in schema['dtypes'].items():
+        if col not in df.columns:
+            continue
+        if dtype == MONEY:
+            if pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = df[col].astype(MONEY)
+        elif dtype == CATEGORY:
+            # Text may come as object or as a string dtype (the pandas 3 default)
+            if pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]):
+                df[col] = df[col].astype(CATEGORY)
+        elif dtype in (DATE, DATE_MIXED):
+            if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = date_parse.parse(df[col], mixed=dtype == DATE_MIXED)
+    return df
+
+
+def check_sample(sample, report_type, null_ratio_limit=0.9):
+    """
+    Check a bounded sample of a report against the registry dtypes.
+
+    Args:
+        sample: Leading rows of the report.
+        report_type: Registry key.
+        null_ratio_limit: Columns emptier than this share of the sample are reported.
+
+    Returns:
+        Dictionary {'dtype_mismatches': Dict[str, str], 'high_null_columns': Dict[str, float]}
+    """
+    result = {'dtype_mismatches': {}, 'high_null_columns': {}}
+    schema = get_schema(report_type)
+    if schema is None or sample.empty:
+        return result
+
+    for col, dtype in schema['dtypes'].items():
+        if col not in sample.columns:
+            continue
+        values = sample[col].dropna()
+        if values.empty:
+            continue
+        if dtype == MONEY and not pd.api.types.is_numeric_dtype(values):
+            result['dtype_mismatches'][col] = f"expected numeric, found {values.dtype}"
+        elif dtype in (DATE, DATE_MIXED) and not pd.api.types.is_datetime64_any_dtype(values):
+            if date_parse.parse(values.astype(str), mixed=dtype == DATE_MIXED).isna().any():
+                result['dtype_mismatches'][col] = "expected dates, found unparseable values"
+
+    null_ratios = sample.isna().mean()
+    for col, ratio in null_ratios[null_ratios > null_ratio_limit].items():
+        result['high_null_columns'][col] = round(float(ratio), 3)
+    return result
+
+
+def read_report(path, report_type):
+    """
+    Load a stored report with its schema applied.
+
+    Only the expected columns are read for fixed-schema reports; unknown report types
+    are loaded as they are.
+    """
+    schema = get_schema(report_type)
+    if schema is None:
+        return report_io.read_dataset(path)
+
+    usecols = None
+    if schema['fixed_columns']:
+        expected = set(schema['columns'])
+        usecols = [col for col in report_io.read_columns(path) if col in expected] or None
+    df = report_io.read_dataset(path, columns=usecols)
+    return apply_schema(df, report_type)
@@ -0,0 +1,247 @@
+import os
+import json
+import shutil
+import time
+import logging
+import threading
+import contextlib
+
+try:
+    import fcntl
+except ImportError:  # Windows: the index is only guarded against this process's threads
+    fcntl = None
+
+# Converted reports live here once, named by the sha256 of the downloaded workbook.
+# The index maps report urls to that hash so later reruns and sessions can skip
+# the download and the Excel conversion entirely.
+# Several server processes may share the store: every index change is made under a
+# file lock on a freshly read index, so no process overwrites another one's entries.
+STORE_DIR = "report_store"
+INDEX_FILE = os.path.join(STORE_DIR, "index.json")
+# Disk cap for stored datasets; past it the least recently used ones are removed
+REPORT_STORE_MB = int(os.getenv('REPORT_STORE_MB', 4096))
+
+if not os.path.exists(STORE_DIR):
+    os.makedirs(STORE_DIR)
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_index = None
+_index_stamp = None   # (inode, mtime, size) of the index file _index was read from
+_stats = {"hits": 0, "revalidated": 0, "stale": 0, "misses": 0, "evicted": 0}
+
+
+def _stamp():
+    try:
+        stat = os.stat(INDEX_FILE)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _load_index():
+    """The url index, read again whenever another process has replaced the file."""
+    global _index, _index_stamp
+    stamp = _stamp()
+    if _index is None or stamp != _index_stamp:
+        try:
+            with open(INDEX_FILE, "r", encoding="utf-8") as f:
+                _index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _index = {}
+        _index_stamp = stamp
+    return _index
+
+
+def _save_index():
+    global _index_stamp
+    # Unique per process and thread, concurrent writers never share a temporary file
+    tmp_path = f"{INDEX_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(_index, f)
+    os.replace(tmp_path, INDEX_FILE)
+    _index_stamp = _stamp()
+
+
+@contextlib.contextmanager
+def _updating_index():
+    """
+    Hold the store's file lock around a read-modify-write of the index.
+
+    Call with _lock held. Yields the index as currently on disk, saved on exit.
+    """
+    with open(INDEX_FILE + ".lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield _load_index()
+            _save_index()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def dataset_path(content_hash, ext=".parquet"):
+    return os.path.join(STORE_DIR, content_hash + ext)
+
+
+def lookup(url, max_age=None):
+    """
+    Find the converted dataset for a report url.
+
+    Args:
+        url: Report link.
+        max_age: Seconds an entry is served without revalidation. None means forever.
+
+    Returns:
+        Index entry dict ('hash', 'path', 'etag', 'last_modified', 'checked_at', 'fresh')
+        or None when the url has never been stored.
+    """
+    with _lock:
+        index = _load_index()
+        entry = index.get(url)
+        if not entry:
+            return None
+        path = dataset_path(entry["hash"], entry.get("ext", ".parquet"))
+        if not os.path.exists(path):
+            return None
+        age = time.time() - entry.get("checked_at", 0)
+        fresh = max_age is None or age < max_age
+        if fresh:
+            _stats["hits"] += 1
+            logger.info(f"Report store hit for {url} ({_stats})")
+        return dict(entry, path=path, fresh=fresh)
+
+
+def mark_not_modified(url):
+    """Record a 304 answer: the stored copy is still current, restart its max-age."""
+    with _lock:
+        with _updating_index() as index:
+            if url in index:
+                index[url]["checked_at"] = time.time()
+        _stats["revalidated"] += 1
+        logger.info(f"Report store revalidated {url} ({_stats})")
+
+
+def mark_stale(url, error):
+    """
+    Record a failed revalidation: the stored copy is served as it is.
+
+    Its max-age is not restarted, the next request for the url tries the origin again.
+    """
+    with _lock:
+        _stats["stale"] += 1
+        logger.warning(f"Revalidation of {url} failed, serving the stored report: {error} ({_stats})")
+
+
+def lookup_hash(content_hash, ext=".parquet"):
+    """Return the dataset path if this exact content was converted before, else None."""
+    path = dataset_path(content_hash, ext)
+    return path if os.path.exists(path) else None
+
+
+def put(url, content_hash, converted_path, ext=".parquet", etag=None, last_modified=None):
+    """
+    Move a freshly converted dataset into the store and point the url at it.
+
+    Returns:
+        The path of the stored dataset.
+    """
+    target = dataset_path(content_hash, ext)
+    with _lock, _updating_index() as index:
+        if not os.path.exists(target):
+            tmp_target = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+            shutil.copyfile(converted_path, tmp_target)
+            os.replace(tmp_target, target)
+        _link(index, url, content_hash, ext, etag, last_modified)
+        _enforce_cap(index, keep=target)
+    return target
+
+
+def link(url, content_hash, ext=".parquet", etag=None, last_modified=None):
+    """Point a url at an already stored dataset."""
+    with _lock, _updating_index() as index:
+        _link(index, url, content_hash, ext, etag, last_modified)
+
+
+def _link(index, url, content_hash, ext, etag, last_modified):
+    index[url] = {
+        "hash": content_hash,
+        "ext": ext,
+        "etag": etag,
+        "last_modified": last_modified,
+        "checked_at": time.time(),
+    }
+    _stats["misses"] += 1
+    logger.info(f"Report store miss for {url} ({_stats})")
+
+
+def _enforce_cap(index, keep=None):
+    """
+    Remove least recently used datasets while the store is over REPORT_STORE_MB.
+
+    Datasets still hard-linked from an upload workspace are skipped, removing them
+    would free no space. Index entries of removed datasets go with them.
+    """
+    used_at = {}
+    for entry in index.values():
+        path = dataset_path(entry["hash"], entry.get("ext", ".parquet"))
+        used_at[path] = max(used_at.get(path, 0.0), entry.get("checked_at", 0.0))
+
+    datasets = []
+    for dir_entry in os.scandir(STORE_DIR):
+        if not dir_entry.is_file() or dir_entry.name == os.path.basename(INDEX_FILE) \
+                or dir_entry.name.endswith((".tmp", ".lock")):
+            continue
+        stat = dir_entry.stat()
+        datasets.append((used_at.get(dir_entry.path, stat.st_mtime), dir_entry.path, stat.st_size, stat.st_nlink))
+    total = sum(size for _, _, size, _ in datasets)
+    cap = REPORT_STORE_MB * 1024 * 1024
+    if total <= cap:
+        return
+
+    removed = set()
+    for _, path, size, nlink in sorted(datasets):
+        if total <= cap:
+            break
+        if path == keep or nlink > 1:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        removed.add(path)
+        total -= size
+        _stats["evicted"] += 1
+    if removed:
+        for url in [url for url, entry in index.items()
+                    if dataset_path(entry["hash"], entry.get("ext", ".parquet")) in removed]:
+            del index[url]
+        logger.info(f"Report store over {REPORT_STORE_MB} MB, removed {len(removed)} datasets ({_stats})")
+
+
+def materialize(stored_path, target_path):
+    """
+    Expose a stored dataset at target_path (the per-user upload folder) without
+    re-converting. Hard links are used where the filesystem allows it.
+    """
+    if os.path.exists(target_path):
+        if os.path.samefile(target_path, stored_path):
+            return target_path
+        # A copy or an older report under the same name: never reuse it
+        os.remove(target_path)
+    try:
+        os.link(stored_path, target_path)
+    except OSError:
+        # Copy under a temporary name so readers never see a partial file
+        tmp_path = f"{target_path}.{os.getpid()}.tmp"
+        shutil.copyfile(stored_path, tmp_path)
+        os.replace(tmp_path, target_path)
+    return target_path
+
+
+def stats():
+    """Return a copy of the hit/revalidated/stale/miss/evicted counters."""
+    with _lock:
+        return dict(_stats)
@@ -8,7 +8,6 @@ from side_func import get_csv_columns
 
 def report_func(df):
         
-    best_sellers_viz.preprocess_data(df)
     columns = get_csv_columns(df)
     
     if "Available Cases (QTY)" in columns and "Product Name" in columns:
@@ -9,7 +9,6 @@ from side_func import get_csv_columns
 def report_func(df):
     
     columns = get_csv_columns(df)
-    current_inventory_viz.preprocess_data(df)
     if "Available Cases (QTY)" in columns and "Wholesale Price" in columns and "Category Name" in columns:
         try:
             with st.container(border=True):
@@ -9,7 +9,6 @@ from side_func import get_csv_columns
 def report_func(df):
     
     columns = get_csv_columns(df)
-    customer_details_viz.preprocess_data(df)
     
     if "Group" in columns and "Total Orders" in columns and "Total Sales" in columns:
         try:
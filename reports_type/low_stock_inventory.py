@@ -9,7 +9,6 @@ from side_func import get_csv_columns
 def report_func(df):
     
     columns = get_csv_columns(df)
-    low_stock_inventory_viz.preprocess_data(df)
     
     if "Category Name" in columns and "Product Name" in columns and "Available Cases (QTY)" in columns and "Wholesale Price" in columns:
         try:
@@ -9,7 +9,6 @@ from side_func import get_csv_columns
 def report_func(df):
     
     columns = get_csv_columns(df)
-    order_sales_summary_viz.preprocess_data(df)
     
     if "Customer" in columns and "Grand Total" in columns and "Product Name" in columns and "Date Created" in columns:
         try:
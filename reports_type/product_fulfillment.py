@@ -9,7 +9,6 @@ def report_func(df):
     #st.success("This report is new, so visualizations are not available yet")
     columns = get_csv_columns(df)
 
-    product_fulfillment_viz.preprocess_data(df)
     css='''
 <style>
 
@@ -9,7 +9,6 @@ from side_func import get_csv_columns
 def report_func(df):
     
     columns = get_csv_columns(df)
-    reps_details_viz.preprocess_data(df)
 
     if "Total Working Hours" in columns and "Total Visits" in columns and "Assigned Customers" in columns and "Role"in columns:
         try:
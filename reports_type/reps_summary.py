@@ -10,7 +10,6 @@ def report_func(df):
     
     columns = get_csv_columns(df)
 
-    reps_summary_viz.preprocess_data(df)
     css='''
 <style>
 
@@ -9,7 +9,6 @@ from side_func import get_csv_columns
 def report_func(df):
     
     columns = get_csv_columns(df)
-    skus_not_ordered_viz.preprocess_data(df)
     
     if "Category Name" in columns:
         try:
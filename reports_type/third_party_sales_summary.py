@@ -7,7 +7,6 @@ from side_func import get_csv_columns
 def report_func(df):
 
     columns = get_csv_columns(df)
-    third_party_sales_viz.preprocess_data(df)
     if "Product Name" in columns and "Grand Total" in columns:
         try:
             with st.container(border=True):
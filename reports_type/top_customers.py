@@ -9,7 +9,6 @@ from side_func import get_csv_columns
 def report_func(df):
     
     columns = get_csv_columns(df)
-    top_customers_viz.preprocess_data(df)
     if "Business Name" in columns and "Total Sales" in columns and "Territory" in columns and "Payment Terms" in columns:
         try:
             with st.container(border=True):
@@ -0,0 +1,138 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+import pandas as pd
+import memory_governor
+
+# Process-wide DataFrame cache shared by all Streamlit sessions.
+# Entries are keyed by report content hash, every session gets a shallow view
+# (no data copy) and copy-on-write keeps a session's column edits out of the shared frame.
+SHARED_CACHE_MAX_MB = int(os.getenv('SHARED_CACHE_MAX_MB', 1024))
+# A session that has not touched an entry for this long no longer counts as a holder
+SESSION_IDLE_SECONDS = int(os.getenv('SESSION_IDLE_SECONDS', 1800))
+
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_entries = OrderedDict()   # key -> {'df', 'bytes', 'holders': {session_id: last_access}}
+_loading = {}              # key -> threading.Lock, so one session loads while others wait
+_stats = {"hits": 0, "loads": 0, "evictions": 0}
+
+
+def _frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _refcount(entry, now):
+    return sum(1 for last_access in entry['holders'].values()
+               if now - last_access < SESSION_IDLE_SECONDS)
+
+
+def _evict(budget_bytes, keep_key):
+    """Drop least recently used entries until the budget holds, unreferenced ones first."""
+    now = time.time()
+    total = sum(entry['bytes'] for entry in _entries.values())
+    for only_unreferenced in (True, False):
+        for key in list(_entries):
+            if total <= budget_bytes:
+                return
+            if key == keep_key:
+                continue
+            entry = _entries[key]
+            if only_unreferenced and _refcount(entry, now):
+                continue
+            total -= entry['bytes']
+            del _entries[key]
+            _stats["evictions"] += 1
+            logger.info(f"Shared cache evicted {key} ({entry['bytes'] / 1e6:.1f} MB)")
+
+
+def get_view(key, session_id, loader):
+    """
+    Return a read-only view of the shared DataFrame for key, loading it once if needed.
+
+    Args:
+        key: Report content hash (plus report type).
+        session_id: Streamlit session asking for the frame, counted as a holder.
+        loader: Zero-argument callable building the DataFrame on a miss.
+
+    Returns:
+        Shallow copy of the cached DataFrame: data is shared, edits stay local.
+    """
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            load_lock = _loading.setdefault(key, threading.Lock())
+        else:
+            _entries.move_to_end(key)
+            entry['holders'][session_id] = time.time()
+            _stats["hits"] += 1
+            return entry['df'].copy(deep=False)
+
+    with load_lock:
+        with _lock:
+            entry = _entries.get(key)
+        loaded = entry is None
+        if loaded:
+            df = loader()
+            entry = {'df': df, 'bytes': _frame_bytes(df), 'holders': {}}
+            with _lock:
+                _entries[key] = entry
+                _loading.pop(key, None)
+                _stats["loads"] += 1
+                _evict(SHARED_CACHE_MAX_MB * 1024 * 1024, key)
+            logger.info(f"Shared cache loaded {key} ({entry['bytes'] / 1e6:.1f} MB)")
+
+    with _lock:
+        entry['holders'][session_id] = time.time()
+        view = entry['df'].copy(deep=False)
+    if loaded:
+        memory_governor.enforce()
+    return view
+
+
+def release(key, session_id):
+    """Stop counting a session as a holder of key (e.g. it opened another report)."""
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            entry['holders'].pop(session_id, None)
+
+
+def _items():
+    """Entries as memory_governor items; only sessions active within SESSION_IDLE_SECONDS count as holders."""
+    with _lock:
+        now = time.time()
+        return [{'key': key, 'bytes': entry['bytes'],
+                 'last_access': max(entry['holders'].values(), default=0.0),
+                 'sessions': [session_id for session_id, last_access in entry['holders'].items()
+                              if now - last_access < SESSION_IDLE_SECONDS]}
+                for key, entry in _entries.items()]
+
+
+def evict(key):
+    """Drop an entry; the next get_view for it reloads it from the report store."""
+    with _lock:
+        entry = _entries.pop(key, None)
+        if entry is not None:
+            _stats["evictions"] += 1
+
+
+memory_governor.register_pool("datasets", _items, evict)
+
+
+def stats():
+    """Return counters plus current entry count, bytes and holders."""
+    with _lock:
+        now = time.time()
+        return dict(
+            _stats,
+            entries=len(_entries),
+            bytes=sum(entry['bytes'] for entry in _entries.values()),
+            holders={key: _refcount(entry, now) for key, entry in _entries.items()},
+        )
@@ -3,6 +3,8 @@ import os
 import streamlit as st  # Make sure to import streamlit for error logging
 import re
 import csv
+import report_registry
+import upload_workspace
 #from main import file_name
 
 UPLOAD_DIR = "uploads"
@@ -11,95 +13,34 @@ if not os.path.exists(UPLOAD_DIR):
     
 def identify_file_mini(file_name):
     try:
-        if file_name == 'THIRD_PARTY_SALES_SUMMARY':
-            return "3rd Party Sales Summary"
-        elif file_name == 'ORDER_SALES_SUMMARY':
-            return "Order Sales Summary"
-        elif file_name == 'BEST_SELLERS':
-            return "Best Sellers"
-        elif file_name == 'REP_DETAILS':
-            return "Representative Details"
-        elif file_name == 'REPS_SUMMARY':
-            return "Reps Summary"
-        elif file_name == 'SKU_NOT_ORDERED':
-            return "SKU's Not Ordered"
-        elif file_name == 'LOW_STOCK_INVENTORY':
-            return "Low Stock Inventory"
-        elif file_name == 'CURRENT_INVENTORY':
-            return "Current Inventory"
-        elif file_name == 'TOP_CUSTOMERS':
-            return "Top Customers"
-        elif file_name == 'CUSTOMER_DETAILS':
-            return "Customer Details"
-        elif file_name == 'INVENTORY_DEPLETION':
-            return "Inventory depletion"
-        elif file_name == 'REPS_VISITS':
-            return "Reps Visits"
-        elif file_name == 'PRODUCT_FULFILLMENT':
-            return "Product fulfillment"
-        elif file_name == 'PAYMENTS':
-            return "Payments"
-        else:
-            return "SimplyDepo"
-        
-
+        return report_registry.title(file_name)
     except Exception as e:
         # Log the exception for debugging
         st.error(f"Error reading file: {e}")
         return "Invalid File"
 
 
-def get_file_name(UPLOAD_DIR):
-    file_name = [
-        f for f in os.listdir(UPLOAD_DIR) if os.path.isfile(os.path.join(UPLOAD_DIR, f))
-    ]
-    try:
-        return file_name[0]
-    except Exception as e:
-        return "Invalid File"
+def current_report(UPLOAD_DIR):
+    """
+    Report record of the session: report type, stored path, content hash and columns.
 
-def identify_file(UPLOAD_DIR):
-    try:
-        file_name = get_file_name(UPLOAD_DIR)
-        #last_uploaded_file_path = os.path.join(UPLOAD_DIR, file_name)
-        #df = pd.read_csv(last_uploaded_file_path, encoding='utf-8')
-        #columns = set(df.columns)
+    It is kept in session_state when the report is ingested, so lookups need no
+    filesystem access; the workspace manifest is only read when a session has none yet.
+    """
+    report = st.session_state.get("report_manifest")
+    if report is None:
+        report = upload_workspace.current_report(UPLOAD_DIR)
+    return report
 
-        
-        # Identify file type based on columns
-        if file_name == 'third_party_sales_summary.csv':
-            return "3rd Party Sales Summary report"
-        elif file_name == 'order_sales_summary.csv':
-            return "Order Sales Summary report"
-        elif file_name == 'best_sellers.csv':
-            return "Best Sellers report"
-        elif file_name == 'rep_details.csv':
-            return "Representative Details report"
-        elif file_name == 'reps_summary.csv':
-            return "Reps Summary report"
-        elif file_name == 'sku_not_ordered.csv':
-            return "SKU's Not Ordered report"
-        elif file_name == 'low_stock_inventory.csv':
-            return "Low Stock Inventory report"
-        elif file_name == 'current_inventory.csv':
-            return "Current Inventory report"
-        elif file_name == 'top_customers.csv':
-            return "Top Customers report"
-        elif file_name == 'customer_details.csv':
-            return "Customer Details report"
-        elif file_name == 'inventory_depletion.csv':
-            return "Inventory Depletion report"
-        elif file_name == 'reps_visits.csv':
-            return "Reps visits report"
-        elif file_name == 'product_fulfillment.csv':
-            return "Product fulfillment report"
-        elif file_name == 'payments.csv':
-            return "Payments report"
-        else:
-            return "SimplyDepo report"
-        
 
+def get_file_name(UPLOAD_DIR):
+    report = current_report(UPLOAD_DIR)
+    return report['file'] if report else "Invalid File"
 
+def identify_file(UPLOAD_DIR):
+    try:
+        report = current_report(UPLOAD_DIR)
+        return report_registry.display_name(report['report_type'] if report else None)
     except Exception as e:
         # Log the exception for debugging
         st.error(f"Error reading file: {e}")
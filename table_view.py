@@ -0,0 +1,151 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import display_format
+import memory_governor
+
+# Server-side paging for the report table.
+# Search and sort produce an array of row positions into the cached report, computed once
+# per (report, sort, search); a page is a slice of that array, so the payload sent to the
+# browser is at most PAGE_SIZE rows whatever the report size.
+PAGE_SIZE = int(os.getenv('TABLE_PAGE_SIZE', 500))
+# Row orderings kept per process, each is one int64 per matching row
+MAX_ORDERINGS = int(os.getenv('TABLE_MAX_ORDERINGS', 32))
+# Formatted pages kept per process
+MAX_PAGES = int(os.getenv('TABLE_MAX_PAGES', 64))
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_orderings = OrderedDict()   # (report_key, sort_by, ascending, search) -> {'positions', 'last_access'}
+_pages = OrderedDict()       # (report_key, report_type, sort_by, ascending, search, page) -> page entry
+
+
+def _search_mask(df, search):
+    """Rows where any column contains search, case-insensitive."""
+    mask = np.zeros(len(df), dtype=bool)
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Match the categories once, then select rows by code
+            categories = values.cat.categories.astype(str)
+            hits = np.flatnonzero(categories.str.contains(search, case=False, regex=False))
+            mask |= np.isin(values.cat.codes.to_numpy(), hits)
+        else:
+            mask |= values.astype(str).str.contains(search, case=False, regex=False).to_numpy()
+    return mask
+
+
+def row_positions(report_key, df, sort_by=None, ascending=True, search=""):
+    """
+    Positions of the rows to show, filtered by search and ordered by sort_by.
+
+    Args:
+        report_key: Shared-cache key of df, changes whenever the data does.
+        df: Cached report DataFrame.
+        sort_by: Column to sort on, None keeps the report order.
+        ascending: Sort direction, missing values always go last.
+        search: Case-insensitive text matched against every column, "" keeps all rows.
+
+    Returns:
+        numpy int64 array of row positions (for df.iloc).
+    """
+    key = (report_key, sort_by, ascending, search)
+    with _lock:
+        entry = _orderings.get(key)
+        if entry is not None:
+            _orderings.move_to_end(key)
+            entry['last_access'] = time.time()
+            return entry['positions']
+
+    if search:
+        positions = np.flatnonzero(_search_mask(df, search))
+    else:
+        positions = np.arange(len(df))
+    if sort_by is not None and sort_by in df.columns:
+        values = df[sort_by].iloc[positions].reset_index(drop=True)
+        order = values.sort_values(ascending=ascending, na_position='last', kind='stable').index
+        positions = positions[order.to_numpy()]
+
+    with _lock:
+        _orderings[key] = {'positions': positions, 'last_access': time.time()}
+        while len(_orderings) > MAX_ORDERINGS:
+            _orderings.popitem(last=False)
+    memory_governor.enforce()
+    return positions
+
+
+def page_count(positions, page_size=PAGE_SIZE):
+    return max(1, -(-len(positions) // page_size))
+
+
+def page_rows(df, positions, page, page_size=PAGE_SIZE):
+    """Rows of one page (1-based) as a new DataFrame, keeping the report's row numbers as index."""
+    start = (page - 1) * page_size
+    return df.iloc[positions[start:start + page_size]].copy()
+
+
+def get_page(report_key, report_type, df, sort_by, ascending, search, page):
+    """
+    One formatted page of the report table plus its column_config, built once.
+
+    report_key changes whenever the underlying data does, so chat or chart
+    interactions and paging back reuse cached pages. Callers only read them.
+
+    Returns:
+        Tuple (DataFrame, Dict[str, column_config]).
+    """
+    key = (report_key, report_type, sort_by, ascending, search, page)
+    with _lock:
+        entry = _pages.get(key)
+        if entry is not None:
+            _pages.move_to_end(key)
+            entry['last_access'] = time.time()
+            return entry['df'], entry['config']
+
+    started = time.perf_counter()
+    column_formats = display_format.report_formats(report_type)
+    positions = row_positions(report_key, df, sort_by, ascending, search)
+    df_page = display_format.format_frame(page_rows(df, positions, page), column_formats)
+    config = display_format.column_config(df_page, column_formats)
+    nbytes = int(df_page.memory_usage(deep=True).sum())
+    logger.debug(f"Table page {page} of {report_key}: {len(config)} numeric columns, "
+                 f"{nbytes / 1e3:.0f} KB, formatted in {(time.perf_counter() - started) * 1e3:.1f} ms")
+
+    with _lock:
+        _pages[key] = {'df': df_page, 'config': config, 'bytes': nbytes, 'last_access': time.time()}
+        while len(_pages) > MAX_PAGES:
+            _pages.popitem(last=False)
+    memory_governor.enforce()
+    return df_page, config
+
+
+def _ordering_items():
+    with _lock:
+        return [{'key': key, 'bytes': int(entry['positions'].nbytes), 'last_access': entry['last_access'],
+                 'sessions': []}
+                for key, entry in _orderings.items()]
+
+
+def _page_items():
+    with _lock:
+        return [{'key': key, 'bytes': entry['bytes'], 'last_access': entry['last_access'], 'sessions': []}
+                for key, entry in _pages.items()]
+
+
+def _evict_ordering(key):
+    with _lock:
+        _orderings.pop(key, None)
+
+
+def _evict_page(key):
+    with _lock:
+        _pages.pop(key, None)
+
+
+memory_governor.register_pool("table_orderings", _ordering_items, _evict_ordering)
+memory_governor.register_pool("table_pages", _page_items, _evict_page)
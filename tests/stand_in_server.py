@@ -0,0 +1,81 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for the report origin: serves one body with validators, answers
+# conditional requests with 304 and Range requests with 206, and can drop the
+# connection part-way through the first transfer to exercise resume.
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        origin = self.server.origin
+        origin.requests.append(dict(self.headers))
+        body = origin.body
+        if (origin.etag and self.headers.get('If-None-Match') == origin.etag) or \
+                (origin.last_modified and not origin.etag
+                 and self.headers.get('If-Modified-Since') == origin.last_modified):
+            self.send_response(304)
+            self._validators()
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        start = 0
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range', origin.etag) == origin.etag:
+            start = int(range_header.split('=')[1].split('-')[0])
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+            for name, value in origin.headers.items():
+                self.send_header(name, value)
+        self._validators()
+        self.send_header('Content-Length', str(len(body) - start))
+        self.end_headers()
+
+        payload = body[start:]
+        if origin.cut_after is not None:
+            cut, origin.cut_after = origin.cut_after, None
+            self.wfile.write(payload[:cut])
+            self.wfile.flush()
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(payload)
+
+    def _validators(self):
+        origin = self.server.origin
+        if origin.etag:
+            self.send_header('ETag', origin.etag)
+        if origin.last_modified:
+            self.send_header('Last-Modified', origin.last_modified)
+
+
+class StandInOrigin:
+    """Context manager running the stand-in origin on a free local port."""
+
+    def __init__(self, body, etag=None, last_modified=None, headers=None, cut_after=None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers or {}
+        self.cut_after = cut_after
+        self.requests = []
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._server.origin = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/report.xlsx"
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
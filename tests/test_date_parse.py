@@ -0,0 +1,64 @@
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+import date_parse
+
+
+def test_infer_format_from_uniform_text():
+    values = pd.Series(["01/15/2024", "02/01/2024", None, "12/31/2023"])
+    assert date_parse.infer_format(values) == "%m/%d/%Y"
+
+
+def test_infer_format_needs_one_format_for_the_whole_sample():
+    assert date_parse.infer_format(pd.Series(["01/15/2024", "2024-01-16"])) is None
+    assert date_parse.infer_format(pd.Series([None, np.nan], dtype=object)) is None
+
+
+def test_parse_with_inferred_format():
+    values = pd.Series(["01/15/2024 08:30", "02/01/2024 17:05"], index=[5, 6], name="Date Created")
+    parsed = date_parse.parse(values)
+    assert parsed.index.tolist() == [5, 6]
+    assert parsed.name == "Date Created"
+    assert parsed.tolist() == [pd.Timestamp("2024-01-15 08:30"), pd.Timestamp("2024-02-01 17:05")]
+
+
+def test_values_outside_the_sample_format_use_the_fallback():
+    # The sample only sees the leading ISO dates, later rows come in other formats
+    leading = ["2024-01-15"] * date_parse.DATE_SAMPLE_ROWS
+    values = pd.Series(leading + ["Jan 17, 2024", "01/18/2024", "garbage"])
+    parsed = date_parse.parse(values, mixed=True)
+    assert (parsed[:len(leading)] == pd.Timestamp("2024-01-15")).all()
+    assert parsed[len(leading):].tolist()[:2] == [pd.Timestamp("2024-01-17"), pd.Timestamp("2024-01-18")]
+    assert pd.isna(parsed.iloc[-1])
+
+    values = pd.Series(leading + ["01/18/2024"])
+    assert date_parse.parse(values).iloc[-1] == pd.Timestamp("2024-01-18")
+
+
+def test_mixed_column_without_a_common_format():
+    values = pd.Series(["2024-01-15", "01/16/2024 10:00", "Jan 17, 2024"])
+    assert date_parse.parse(values, mixed=True).tolist() == [
+        pd.Timestamp("2024-01-15"), pd.Timestamp("2024-01-16 10:00"), pd.Timestamp("2024-01-17")]
+
+
+@pytest.mark.parametrize("mixed", [False, True])
+def test_invalid_values_become_nat(mixed):
+    values = pd.Series(["01/15/2024", "not a date", None, "", "13/45/2024", "02/01/2024"])
+    parsed = date_parse.parse(values, mixed=mixed)
+    assert pd.api.types.is_datetime64_any_dtype(parsed)
+    assert parsed.isna().tolist() == [False, True, True, True, True, False]
+    assert parsed[[0, 5]].tolist() == [pd.Timestamp("2024-01-15"), pd.Timestamp("2024-02-01")]
+
+
+def test_datetime_objects_convert_directly():
+    # Dates the workbook reader already turned into datetime objects
+    values = pd.Series([datetime.datetime(2024, 1, 15, 8, 30), None, datetime.datetime(2024, 2, 1)], dtype=object)
+    parsed = date_parse.parse(values)
+    assert pd.api.types.is_datetime64_any_dtype(parsed)
+    assert parsed[0] == pd.Timestamp("2024-01-15 08:30") and pd.isna(parsed[1])
+
+
+def test_datetime64_columns_are_returned_as_they_are():
+    values = pd.Series(pd.to_datetime(["2024-01-15", None]))
+    assert date_parse.parse(values) is values
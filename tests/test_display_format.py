@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+import display_format
+from display_format import add_dollar_sign, format_currency, format_ids, id_str
+
+# The column formatters must produce exactly what the scalar formatters do per cell.
+EDGE_VALUES = [
+    0.0, -0.0, 0.5, 1.5, 2.5, -0.5, 0.005, 0.015, 0.125, -0.125, 1e-9, -1e-9,
+    131072.01, 150000.37, 262144.01, 999999999.995, 1e9, 1e15, 1e16, 1e18, 9.3e18, 1e19,
+    1e300, -1e300, np.nan, np.inf, -np.inf,
+]
+
+
+def _scalar(values, func):
+    return [func(value.item()) for value in np.asarray(values)]
+
+
+def _random_floats(rng, size):
+    magnitude = 10.0 ** rng.uniform(-4, 20, size)
+    values = rng.choice([-1, 1], size) * magnitude
+    # Cent values and ties, which exercise the rounding fallback
+    values[::3] = np.round(values[::3], 2)
+    values[1::7] = np.floor(values[1::7]) + 0.5
+    values[2::11] = np.nan
+    return values
+
+
+@pytest.mark.parametrize("values", [
+    [],
+    [np.nan],
+    [np.nan, np.nan],
+    [np.inf, -np.inf],
+    [1e19, -1e300],
+    EDGE_VALUES,
+], ids=["empty", "nan", "all-nan", "inf", "out-of-range", "edges"])
+def test_currency_and_ids_match_scalar_on_edge_inputs(values):
+    series = pd.Series(values, dtype=np.float64)
+    assert format_currency(series).tolist() == _scalar(series, add_dollar_sign)
+    assert format_ids(series).tolist() == _scalar(series, id_str)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_currency_and_ids_match_scalar_on_random_floats(seed):
+    series = pd.Series(_random_floats(np.random.default_rng(seed), 2000))
+    assert format_currency(series).tolist() == _scalar(series, add_dollar_sign)
+    assert format_ids(series).tolist() == _scalar(series, id_str)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ids_match_scalar_on_random_integers(seed):
+    rng = np.random.default_rng(seed)
+    # Integers are formatted through float64 by both paths, keep them exactly representable
+    series = pd.Series(rng.integers(-2 ** 53, 2 ** 53, 2000))
+    assert format_ids(series).tolist() == _scalar(series, id_str)
+    assert format_currency(series).tolist() == _scalar(series, add_dollar_sign)
+
+
+def test_text_columns_match_scalar():
+    series = pd.Series(["$12.50", "1,234", "12.5", "abc", None, np.nan, "-3", ""], dtype=object)
+    assert format_currency(series).tolist() == [add_dollar_sign(v if v is not None else np.nan) for v in series]
+    assert format_ids(series).tolist() == [id_str(v if v is not None else np.nan) for v in series]
+
+
+def test_format_frame_keeps_index_and_handles_empty_frame():
+    df = pd.DataFrame({'Grand Total': pd.Series([], dtype=np.float64), 'Order ID': pd.Series([], dtype=np.float64)})
+    saved = display_format.NUMERIC_RENDER
+    display_format.NUMERIC_RENDER = 0
+    try:
+        formatted = display_format.format_frame(df.copy())
+    finally:
+        display_format.NUMERIC_RENDER = saved
+    assert formatted.empty
+    assert list(formatted.columns) == ['Grand Total', 'Order ID']
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+import frame_compact
+
+
+def _report(text_dtype=object):
+    return pd.DataFrame({
+        'Customer': pd.Series(["a", "b", None, "a"] * 250, dtype=text_dtype),
+        'QTY': np.arange(1000, dtype=np.int64),
+        'Grand Total': np.tile([1.5, 2.25, 150000.37, np.nan], 250),
+    })
+
+
+# None builds the column with the installed pandas' default text dtype
+@pytest.mark.parametrize("text_dtype", [None, object, "string"])
+def test_expand_restores_original_dtypes_and_values(text_dtype):
+    original = _report(text_dtype)
+    compacted = frame_compact.compact(_report(text_dtype))
+    assert isinstance(compacted['Customer'].dtype, pd.CategoricalDtype)
+    restored = frame_compact.expand(compacted)
+    pd.testing.assert_frame_equal(restored, original)
+    assert frame_compact.ATTR not in restored.attrs
+
+
+def test_expanded_is_built_once_per_key():
+    compacted = frame_compact.compact(_report())
+    first = frame_compact.expanded("report:TEST", compacted.copy(deep=False))
+    second = frame_compact.expanded("report:TEST", compacted.copy(deep=False))
+    pd.testing.assert_frame_equal(second, _report())
+    # The rebuilt object column is reused, not rebuilt per call
+    assert np.shares_memory(first['Customer'].to_numpy(), second['Customer'].to_numpy())
+    # Callers get their own frame
+    second['Extra'] = 1
+    assert 'Extra' not in frame_compact.expanded("report:TEST", compacted)
+    frame_compact.evict("report:TEST")
@@ -0,0 +1,55 @@
+import base64
+import hashlib
+import pytest
+import http_client
+from stand_in_server import StandInOrigin
+
+BODY = b"report," * 5000
+
+
+def test_etag_that_is_not_the_md5_is_ignored(tmp_path):
+    # SSE-KMS / SSE-C S3 ETags look like an MD5 but are not one
+    target = tmp_path / "report.xlsx"
+    with StandInOrigin(BODY, etag='"' + "a" * 32 + '"') as origin:
+        result = http_client.stream_to_file(origin.url, str(target))
+    assert result['status'] == 200
+    assert target.read_bytes() == BODY
+
+
+def test_etag_md5_is_verified_when_enabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_client, 'ETAG_IS_MD5', 1)
+    with StandInOrigin(BODY, etag='"' + "a" * 32 + '"') as origin:
+        with pytest.raises(OSError, match="Checksum mismatch"):
+            http_client.stream_to_file(origin.url, str(tmp_path / "bad.xlsx"))
+    with StandInOrigin(BODY, etag='"' + hashlib.md5(BODY).hexdigest() + '"') as origin:
+        assert http_client.stream_to_file(origin.url, str(tmp_path / "good.xlsx"))['status'] == 200
+
+
+@pytest.mark.parametrize("header, digest", [
+    ('Content-MD5', hashlib.md5),
+    ('x-amz-checksum-sha256', hashlib.sha256),
+])
+def test_checksum_headers_are_verified(tmp_path, header, digest):
+    good = base64.b64encode(digest(BODY).digest()).decode()
+    with StandInOrigin(BODY, headers={header: good}) as origin:
+        assert http_client.stream_to_file(origin.url, str(tmp_path / "good.xlsx"))['status'] == 200
+
+    bad = base64.b64encode(digest(b"other").digest()).decode()
+    target = tmp_path / "bad.xlsx"
+    with StandInOrigin(BODY, headers={header: bad}) as origin:
+        with pytest.raises(OSError, match="Checksum mismatch"):
+            http_client.stream_to_file(origin.url, str(target))
+    assert not target.exists()
+    assert not (tmp_path / "bad.xlsx.part").exists()
+
+
+def test_interrupted_download_resumes(tmp_path):
+    target = tmp_path / "report.xlsx"
+    md5 = base64.b64encode(hashlib.md5(BODY).digest()).decode()
+    with StandInOrigin(BODY, etag='"v1"', headers={'Content-MD5': md5}, cut_after=10000) as origin:
+        result = http_client.stream_to_file(origin.url, str(target))
+    assert target.read_bytes() == BODY
+    assert result['hash'] == hashlib.sha256(BODY).hexdigest()
+    # Resumed from the last whole chunk written, not from the start
+    assert len(origin.requests) == 2
+    assert origin.requests[1]['Range'].startswith("bytes=") and origin.requests[1]['Range'] != "bytes=0-"
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+import order_index
+
+
+def _lines(product_dtype=object):
+    return pd.DataFrame({
+        'Order ID': [101, 101, 102, np.nan, 103, np.nan, 102, 104, 101],
+        'Product Name': pd.Series(["Cola", "Chips", "Cola", "Cola", None, "Chips", "Cola", "Water", "Cola"],
+                                  dtype=product_dtype),
+        'Grand Total': [10.0, 10.0, 4.5, 3.0, 8.0, 3.0, 4.5, 1.0, 10.0],
+    })
+
+
+@pytest.fixture
+def report():
+    key = "report:ORDER_SALES_SUMMARY:prepared"
+    df = _lines()
+    df.attrs[order_index.REPORT_KEY_ATTR] = key
+    order_index.build(key, df)
+    yield df
+    order_index.evict(key)
+
+
+def test_orders_matches_drop_duplicates(report):
+    expected = report.drop_duplicates(subset=['Order ID'])
+    pd.testing.assert_frame_equal(order_index.orders(report), expected)
+    # Callers may add columns without touching the cached table
+    orders = order_index.orders(report)
+    orders['Extra'] = 1
+    assert 'Extra' not in order_index.orders(report).columns
+
+
+@pytest.mark.parametrize("product_dtype", [object, "category"])
+def test_orders_per_item_matches_drop_duplicates(product_dtype):
+    key = f"report:TEST:{product_dtype}"
+    df = _lines(product_dtype)
+    df.attrs[order_index.REPORT_KEY_ATTR] = key
+    order_index.build(key, df)
+    expected = df.drop_duplicates(subset=['Order ID', 'Product Name']).groupby('Product Name', observed=True).size()
+    # Built once, then served from the cache
+    for _ in range(2):
+        pd.testing.assert_series_equal(order_index.orders_per_item(df, 'Product Name'), expected)
+    order_index.evict(key)
+
+
+def test_filtered_frames_fall_back(report):
+    # Same report key, but not the rows the table was built from
+    filtered = report[report['Grand Total'] > 3.5]
+    assert filtered.attrs[order_index.REPORT_KEY_ATTR] == report.attrs[order_index.REPORT_KEY_ATTR]
+    pd.testing.assert_frame_equal(order_index.orders(filtered), filtered.drop_duplicates(subset=['Order ID']))
+    pd.testing.assert_series_equal(
+        order_index.orders_per_item(filtered, 'Product Name'),
+        filtered.drop_duplicates(subset=['Order ID', 'Product Name']).groupby('Product Name', observed=True).size())
+
+    reordered = report.iloc[::-1]
+    pd.testing.assert_frame_equal(order_index.orders(reordered), reordered.drop_duplicates(subset=['Order ID']))
+
+
+def test_frames_without_report_key_fall_back():
+    df = _lines()
+    pd.testing.assert_frame_equal(order_index.orders(df), df.drop_duplicates(subset=['Order ID']))
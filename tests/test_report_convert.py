@@ -0,0 +1,65 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+import report_convert
+import report_io
+from report_schema import read_report
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="needs a named pipe to block the reader")
+def test_killed_job_does_not_affect_queued_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_convert, '_slots', threading.BoundedSemaphore(1))
+    # Opening a FIFO nobody writes to blocks in native code, so only the watchdog's kill ends it
+    stuck = tmp_path / "stuck.xlsx"
+    os.mkfifo(stuck)
+    missing = tmp_path / "missing.xlsx"
+    results = {}
+
+    def run(name, path):
+        results[name] = report_convert.convert_in_pool(str(path), timeout=1)
+
+    threads = [threading.Thread(target=run, args=("stuck", stuck)),
+               threading.Thread(target=run, args=("queued", missing))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results["stuck"]['reason'] == 'timeout'
+    # Waited longer than its own limit for the slot, but still ran
+    assert results["queued"]['reason'] == 'failed'
+
+
+def test_converted_workbook_round_trips_through_report_io(tmp_path):
+    workbook = tmp_path / "orders.xlsx"
+    pd.DataFrame({
+        'Order ID': [101, 102, 103],
+        'Customer': ["Corner Store", "Corner\nStore", None],
+        'Date Created': ["01/15/2024", "01/16/2024", "02/01/2024"],
+        'Grand Total': [1234.5, 0.99, 150000.37],
+        'Customer ID': ["17", "18", "19"],
+        'Unlisted': ["x", "y", "z"],
+    }).to_excel(workbook, index=False)
+
+    path = report_convert.convert_excel_to_csv(str(workbook))
+    assert path == str(tmp_path / "orders.parquet")
+    assert not workbook.exists()
+
+    assert report_io.read_columns(path) == [
+        'Order ID', 'Customer', 'Date Created', 'Grand Total', 'Customer ID', 'Unlisted']
+    sample = report_io.read_sample(path, 2)
+    assert sample['Order ID'].tolist() == [101, 102]
+
+    df = read_report(path, "ORDER_SALES_SUMMARY")
+    # Columns outside the schema are not loaded
+    assert 'Unlisted' not in df.columns
+    assert df['Grand Total'].dtype == np.float64
+    assert df['Grand Total'].tolist() == [1234.5, 0.99, 150000.37]
+    # Numeric text is inferred as numbers, as the old CSV round trip did
+    assert df['Customer ID'].tolist() == [17, 18, 19]
+    assert isinstance(df['Customer'].dtype, pd.CategoricalDtype)
+    assert df['Customer'].tolist()[:2] == ["Corner Store", "Corner Store"]
+    assert df['Date Created'].tolist() == [
+        pd.Timestamp("2024-01-15"), pd.Timestamp("2024-01-16"), pd.Timestamp("2024-02-01")]
@@ -0,0 +1,41 @@
+import hashlib
+from report_download import download_report
+from stand_in_server import StandInOrigin
+
+BODY = b"workbook bytes" * 1000
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+def test_etag_revalidation_skips_unchanged_body(tmp_path):
+    target = tmp_path / "report.xlsx"
+    with StandInOrigin(BODY, etag='"v1"') as origin:
+        first = download_report(origin.url, str(target))
+        target.unlink()
+        second = download_report(origin.url, str(target), etag=first['etag'])
+    assert first['not_modified'] is False
+    assert first['hash'] == hashlib.sha256(BODY).hexdigest()
+    assert first['etag'] == '"v1"'
+    assert second['not_modified'] is True
+    assert second['etag'] == '"v1"'
+    assert origin.requests[1]['If-None-Match'] == '"v1"'
+    # Nothing is written on a 304
+    assert not target.exists()
+
+
+def test_last_modified_revalidation(tmp_path):
+    target = tmp_path / "report.xlsx"
+    with StandInOrigin(BODY, last_modified=LAST_MODIFIED) as origin:
+        first = download_report(origin.url, str(target))
+        second = download_report(origin.url, str(target), last_modified=first['last_modified'])
+    assert first['last_modified'] == LAST_MODIFIED
+    assert second['not_modified'] is True
+    assert origin.requests[1]['If-Modified-Since'] == LAST_MODIFIED
+
+
+def test_changed_report_is_downloaded_again(tmp_path):
+    target = tmp_path / "report.xlsx"
+    with StandInOrigin(BODY + b"changed", etag='"v2"') as origin:
+        result = download_report(origin.url, str(target), etag='"v1"')
+    assert result['not_modified'] is False
+    assert result['etag'] == '"v2"'
+    assert target.read_bytes() == BODY + b"changed"
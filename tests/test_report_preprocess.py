@@ -0,0 +1,58 @@
+import re
+import numpy as np
+import pandas as pd
+import pytest
+from report_preprocess import preprocess, parse_hours, PARSE_CURRENCY
+
+# None builds the column with the installed pandas' default text dtype
+TEXT_DTYPES = [None, object, "string"]
+
+
+@pytest.mark.parametrize("text_dtype", TEXT_DTYPES)
+def test_parse_currency_parses_text_columns(text_dtype):
+    df = pd.DataFrame({'Grand Total': pd.Series(["$1,234.50", "$0.99", None, "n/a"], dtype=text_dtype)})
+    df = preprocess(df, "ORDER_SALES_SUMMARY", steps=(PARSE_CURRENCY,))
+    assert df['Grand Total'].dtype == np.float64
+    assert df['Grand Total'].iloc[:2].tolist() == [1234.50, 0.99]
+    assert df['Grand Total'].iloc[2:].isna().all()
+
+
+def test_parse_currency_leaves_numeric_columns_alone():
+    df = pd.DataFrame({'Grand Total': [1.5, 2.25]})
+    df = preprocess(df, "ORDER_SALES_SUMMARY", steps=(PARSE_CURRENCY,))
+    assert df['Grand Total'].tolist() == [1.5, 2.25]
+
+
+def _parse_time(time_str):
+    # The per-row parser parse_hours replaced in reps_details_viz
+    if pd.isna(time_str):
+        return 0
+    match = re.match(r'(\d+)h\s*(\d+)m', time_str)
+    if match:
+        h, m = map(int, match.groups())
+    else:
+        match = re.match(r'(\d+)m', time_str)
+        if match:
+            m = int(match.group(1))
+            h = 0
+        else:
+            h, m = 0, 0
+    return h + m / 60
+
+
+@pytest.mark.parametrize("text_dtype", TEXT_DTYPES)
+def test_parse_hours_matches_parse_time(text_dtype):
+    values = ["8h 30m", "8h30m", "45m", "5h", None, "", "n/a", "0h 0m", "12h 5m extra",
+              "90m", "8h 30m", "on leave 2h 10m", "10h  15m"]
+    series = pd.Series(values, dtype=text_dtype, name='Total Working Hours')
+    hours = parse_hours(series)
+    assert hours.dtype == np.float64
+    assert hours.name == 'Total Working Hours'
+    assert hours.tolist() == [float(_parse_time(value)) for value in series.astype(object)]
+
+
+def test_parse_hours_of_missing_and_unmatched_values_is_zero():
+    series = pd.Series([np.nan, None, "", "5h", "none"], index=[10, 11, 12, 13, 14], dtype=object)
+    hours = parse_hours(series)
+    assert hours.index.tolist() == [10, 11, 12, 13, 14]
+    assert hours.tolist() == [0.0] * 5
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+import display_format
+import frame_compact
+from report_schema import apply_schema
+
+
+def test_money_keeps_cents_above_float32_precision():
+    amounts = [150000.37, 262144.01, 131072.01, 12.5, 9999999.99]
+    df = pd.DataFrame({'Order ID': [1, 2, 3, 4, 5], 'Grand Total': amounts})
+    df = frame_compact.expand(frame_compact.compact(apply_schema(df, "ORDER_SALES_SUMMARY")))
+    assert df['Grand Total'].dtype == np.float64
+    assert df['Grand Total'].tolist() == amounts
+    assert display_format.format_currency(df['Grand Total']).tolist() == [
+        "$150000.37", "$262144.01", "$131072.01", "$12.50", "$9999999.99"]
+    assert df['Grand Total'].sum() == sum(amounts)
+
+
+@pytest.mark.parametrize("text_dtype", [None, object, "string"])
+def test_category_columns_built_from_text(text_dtype):
+    # None builds the column with the installed pandas' default text dtype
+    df = pd.DataFrame({'Payment Status': pd.Series(["Paid", "Unpaid", "Paid", None], dtype=text_dtype)})
+    df = apply_schema(df, "PAYMENTS")
+    assert isinstance(df['Payment Status'].dtype, pd.CategoricalDtype)
+    assert df['Payment Status'].tolist()[:3] == ["Paid", "Unpaid", "Paid"]
+    assert df['Payment Status'].isna().tolist() == [False, False, False, True]
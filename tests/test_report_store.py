@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+import report_store
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store_dir = tmp_path / "store"
+    store_dir.mkdir()
+    monkeypatch.setattr(report_store, 'STORE_DIR', str(store_dir))
+    monkeypatch.setattr(report_store, 'INDEX_FILE', str(store_dir / "index.json"))
+    monkeypatch.setattr(report_store, '_index', None)
+    return tmp_path
+
+
+def _converted(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def test_materialize_replaces_stale_file_of_same_size(store):
+    stored = report_store.put("url-1", "hash1", _converted(store, "new.parquet", 100))
+    target = store / "report.parquet"
+    target.write_bytes(b"y" * 100)
+    path = report_store.materialize(stored, str(target))
+    assert open(path, "rb").read() == b"x" * 100
+
+
+def test_materialize_reuses_hard_link(store):
+    stored = report_store.put("url-1", "hash1", _converted(store, "new.parquet", 100))
+    target = str(store / "report.parquet")
+    report_store.materialize(stored, target)
+    inode = os.stat(target).st_ino
+    report_store.materialize(stored, target)
+    assert os.stat(target).st_ino == inode
+
+
+def test_cap_evicts_least_recently_used(store, monkeypatch):
+    monkeypatch.setattr(report_store, 'REPORT_STORE_MB', 1)
+    half = 600 * 1024
+    first = report_store.put("url-1", "hash1", _converted(store, "a.parquet", half))
+    # Hard-linked from a workspace: removing it would free nothing
+    linked = report_store.put("url-2", "hash2", _converted(store, "b.parquet", half))
+    report_store.materialize(linked, str(store / "workspace.parquet"))
+    latest = report_store.put("url-3", "hash3", _converted(store, "c.parquet", half))
+
+    assert not os.path.exists(first)
+    assert os.path.exists(linked) and os.path.exists(latest)
+    assert report_store.lookup("url-1") is None
+    assert report_store.lookup("url-3")["path"] == latest
+
+
+def test_link_keeps_entries_written_by_another_process(store):
+    report_store.link("url-1", "hash1")
+    # Another server process adds its own entry after this one cached the index
+    index_file = report_store.INDEX_FILE
+    with open(index_file, encoding="utf-8") as f:
+        index = json.load(f)
+    index["url-2"] = dict(index["url-1"], hash="hash2")
+    with open(index_file, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+
+    report_store.link("url-3", "hash3")
+    with open(index_file, encoding="utf-8") as f:
+        assert sorted(json.load(f)) == ["url-1", "url-2", "url-3"]
+
+
+_LINK_MANY = """
+import sys
+import report_store
+for i in range(int(sys.argv[2])):
+    report_store.link(f"{sys.argv[1]}-{i}", "hash")
+"""
+
+
+@pytest.mark.skipif(report_store.fcntl is None, reason="needs file locks")
+def test_concurrent_processes_lose_no_index_entries(tmp_path):
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=repo_root)
+    workers = [subprocess.Popen([sys.executable, "-c", _LINK_MANY, f"worker{n}", "25"], cwd=tmp_path, env=env)
+               for n in range(4)]
+    assert all(worker.wait(timeout=60) == 0 for worker in workers)
+    with open(tmp_path / "report_store" / "index.json", encoding="utf-8") as f:
+        assert len(json.load(f)) == 100
+    assert not [name for name in os.listdir(tmp_path / "report_store") if name.endswith(".tmp")]
+
+
+def test_failed_revalidation_keeps_entry_due(store):
+    report_store.put("url-1", "hash1", _converted(store, "new.parquet", 100))
+    checked_at = report_store.lookup("url-1")["checked_at"]
+    before = report_store.stats()
+    report_store.mark_stale("url-1", "connection refused")
+
+    entry = report_store.lookup("url-1", max_age=0)
+    assert entry["checked_at"] == checked_at and not entry["fresh"]
+    after = report_store.stats()
+    assert after["stale"] == before["stale"] + 1
+    assert after["revalidated"] == before["revalidated"]
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+import table_view
+
+
+def _report(rows=7):
+    customers = ["Corner Store", "deli on main", None, "Corner Store", "Gas & Go", "DELI 2", "Corner Store"]
+    return pd.DataFrame({
+        'Customer': pd.Categorical((customers * rows)[:rows]),
+        'Note': np.array((["rush", None, "Call the deli", "", "RUSH order", "n/a", "ok"] * rows)[:rows], dtype=object),
+        'Grand Total': ([3.0, np.nan, 1.0, 3.0, 2.0, np.nan, 1.0] * rows)[:rows],
+    }, index=range(100, 100 + rows))
+
+
+def test_search_matches_categorical_and_text_columns():
+    df = _report()
+    # "deli" is in two customers (categorical) and one note (text), case-insensitive
+    assert table_view.row_positions("search:1", df, search="deli").tolist() == [1, 2, 5]
+    assert table_view.row_positions("search:1", df, search="RUSH").tolist() == [0, 4]
+    assert table_view.row_positions("search:1", df, search="no such text").tolist() == []
+    # Plain text, not a pattern
+    assert table_view.row_positions("search:1", df, search="gas & go").tolist() == [4]
+
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_sort_is_stable_with_missing_values_last(ascending):
+    df = _report()
+    positions = table_view.row_positions(f"sort:{ascending}", df, sort_by='Grand Total', ascending=ascending)
+    expected = [2, 6, 4, 0, 3, 1, 5] if ascending else [0, 3, 4, 2, 6, 1, 5]
+    assert positions.tolist() == expected
+
+
+def test_sort_applies_to_search_results():
+    df = _report()
+    # Categories sort in category order, the match on the note (no customer) goes last
+    assert table_view.row_positions("sort:search", df, sort_by='Customer', search="deli").tolist() == [5, 1, 2]
+
+
+def test_pages_cover_every_row_once():
+    df = _report(rows=23)
+    positions = table_view.row_positions("pages:1", df, sort_by='Grand Total')
+    pages = table_view.page_count(positions, page_size=5)
+    assert pages == 5
+    rows = pd.concat([table_view.page_rows(df, positions, page, page_size=5) for page in range(1, pages + 1)])
+    assert rows.index.tolist() == df.index[positions].tolist()
+    assert sorted(rows.index) == list(df.index)
+    # The last page holds the remainder and reaches the last row
+    last = table_view.page_rows(df, positions, pages, page_size=5)
+    assert len(last) == 3 and last.index[-1] == df.index[positions[-1]]
+    assert table_view.page_rows(df, positions, pages + 1, page_size=5).empty
+
+
+def test_page_count_of_empty_result_is_one():
+    assert table_view.page_count(np.array([], dtype=np.int64), page_size=5) == 1
+
+
+def test_get_page_reaches_the_last_row():
+    size = table_view.PAGE_SIZE
+    df = _report(rows=2 * size + 3)
+    positions = table_view.row_positions("get_page:1", df)
+    pages = table_view.page_count(positions)
+    assert pages == 3
+    first, _ = table_view.get_page("get_page:1", None, df, None, True, "", 1)
+    last, _ = table_view.get_page("get_page:1", None, df, None, True, "", pages)
+    assert first.index.tolist() == list(df.index[:size])
+    assert last.index.tolist() == list(df.index[-3:])
+    # Built once, then served from the page cache
+    assert table_view.get_page("get_page:1", None, df, None, True, "", pages)[0] is last
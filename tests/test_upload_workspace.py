@@ -0,0 +1,42 @@
+import os
+import time
+import pytest
+import upload_workspace
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_workspace, 'UPLOAD_ROOT', str(tmp_path / "uploads"))
+    os.makedirs(upload_workspace.UPLOAD_ROOT)
+    return tmp_path
+
+
+def _idle_workspace(user_id, now):
+    directory = upload_workspace.workspace_dir(user_id)
+    os.makedirs(directory)
+    upload_workspace._write_manifest(directory, {"files": {}, "accessed_at": now - 3600})
+    return directory
+
+
+def test_quota_ignores_hard_links_into_the_store(root, monkeypatch):
+    monkeypatch.setattr(upload_workspace, 'UPLOAD_QUOTA_MB', 1)
+    now = time.time()
+    stored = root / "stored.parquet"
+    stored.write_bytes(b"x" * 2 * 1024 * 1024)
+    for user_id in ("a", "b"):
+        os.link(stored, os.path.join(_idle_workspace(user_id, now), "report.parquet"))
+
+    result = upload_workspace.sweep(now)
+    assert result['removed'] == 0
+    assert sorted(os.listdir(upload_workspace.UPLOAD_ROOT)) == ["a", "b"]
+
+
+def test_quota_evicts_owned_files(root, monkeypatch):
+    monkeypatch.setattr(upload_workspace, 'UPLOAD_QUOTA_MB', 1)
+    now = time.time()
+    for user_id in ("a", "b"):
+        with open(os.path.join(_idle_workspace(user_id, now), "report.parquet"), "wb") as f:
+            f.write(b"x" * 768 * 1024)
+
+    result = upload_workspace.sweep(now)
+    assert result['removed'] == 1
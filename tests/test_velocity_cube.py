@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+import order_index
+import velocity_cube
+
+FREQUENCIES = ["D", "W-SUN", "ME"]
+
+
+def _lines(customer_dtype=object):
+    # Times of day, gap days (nothing sold 2024-01-04 to 2024-01-08) and lines without a customer
+    dates = pd.to_datetime([
+        "2024-01-01 09:15", "2024-01-01 17:40", "2024-01-03 08:00", "2024-01-09 12:00",
+        "2024-01-14 23:59", "2024-01-15 00:00", "2024-01-31 18:30", "2024-02-01 07:00",
+        "2024-02-29 10:00", "2024-03-03 11:11",
+    ])
+    return pd.DataFrame({
+        'Date Created': dates,
+        'Customer': pd.Series(["Corner Store", None, "Corner Store", "Deli", None,
+                               "Deli", "Corner Store", "Deli", None, "Corner Store"], dtype=customer_dtype),
+        'QTY': [3, 5, 1, 2, 7, 4, 6, 1, 2, 9],
+    })
+
+
+def _expected(data, freq_alias):
+    # The resample / pd.Grouper computations the cube replaced
+    total = data[['Date Created', 'QTY']].resample(freq_alias, on='Date Created')['QTY'].sum().reset_index()
+    total.rename(columns={'Date Created': 'Period', 'QTY': 'Total Units Sold'}, inplace=True)
+    store = data.groupby(['Customer', pd.Grouper(key='Date Created', freq=freq_alias)],
+                         observed=True)['QTY'].sum().reset_index()
+    store.rename(columns={'Date Created': 'Period', 'QTY': 'Units Sold'}, inplace=True)
+    return total, store
+
+
+@pytest.mark.parametrize("customer_dtype", [object, "category"])
+@pytest.mark.parametrize("freq_alias", FREQUENCIES)
+def test_roll_ups_match_resample(freq_alias, customer_dtype):
+    key = f"report:ORDER_SALES_SUMMARY:{customer_dtype}"
+    data = _lines(customer_dtype)
+    data.attrs[order_index.REPORT_KEY_ATTR] = key
+    total, store = _expected(data, freq_alias)
+    # Built from the daily cube, then served from the cached view
+    for _ in range(2):
+        result = velocity_cube.velocity(data, freq_alias)
+        pd.testing.assert_frame_equal(result['total'], total)
+        pd.testing.assert_frame_equal(result['store'], store)
+    velocity_cube.evict((key, 'Date Created', 'QTY', 'Customer'))
+
+
+@pytest.mark.parametrize("freq_alias", FREQUENCIES)
+def test_frames_without_report_key_match_resample(freq_alias):
+    data = _lines()
+    total, store = _expected(data, freq_alias)
+    result = velocity_cube.velocity(data, freq_alias)
+    pd.testing.assert_frame_equal(result['total'], total)
+    pd.testing.assert_frame_equal(result['store'], store)
+
+
+def test_unsupported_frequency():
+    with pytest.raises(ValueError):
+        velocity_cube.velocity(_lines(), "QE")
@@ -0,0 +1,214 @@
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+
+# Per-user upload workspaces.
+# Every workspace has a manifest listing the files the app put there; files are written
+# through a temporary name and renamed, so readers never see a partial file and nothing
+# has to wait for writes to settle. A background sweeper removes workspaces unused for
+# WORKSPACE_TTL_SECONDS and, past UPLOAD_QUOTA_MB, the least recently used ones. The
+# quota only counts files the workspace owns, not hard links into report_store.
+UPLOAD_ROOT = "uploads"
+MANIFEST_FILE = "manifest.json"
+WORKSPACE_TTL_SECONDS = int(os.getenv('WORKSPACE_TTL_SECONDS', 24 * 3600))
+UPLOAD_QUOTA_MB = int(os.getenv('UPLOAD_QUOTA_MB', 2048))
+SWEEP_INTERVAL_SECONDS = int(os.getenv('WORKSPACE_SWEEP_SECONDS', 600))
+# Workspaces used this recently are never removed for the quota
+ACTIVE_SECONDS = 15 * 60
+# Access times are written to the manifest at most this often
+TOUCH_INTERVAL_SECONDS = 60
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_sweeper = None
+
+
+def workspace_dir(user_id):
+    return os.path.join(UPLOAD_ROOT, str(user_id))
+
+
+def _manifest_path(directory):
+    return os.path.join(directory, MANIFEST_FILE)
+
+
+def _read_manifest(directory):
+    try:
+        with open(_manifest_path(directory), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}, "accessed_at": 0.0}
+
+
+def _write_manifest(directory, manifest):
+    # Unique temporary name so workers sharing the volume never write the same file
+    tmp_path = f"{_manifest_path(directory)}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, _manifest_path(directory))
+
+
+def open_workspace(user_id):
+    """
+    Create (or touch) a user's workspace and make sure the sweeper runs.
+
+    Returns:
+        Workspace directory path.
+    """
+    directory = workspace_dir(user_id)
+    os.makedirs(directory, exist_ok=True)
+    with _lock:
+        manifest = _read_manifest(directory)
+        if time.time() - manifest.get("accessed_at", 0.0) > TOUCH_INTERVAL_SECONDS:
+            manifest["accessed_at"] = time.time()
+            _write_manifest(directory, manifest)
+    start_sweeper()
+    return directory
+
+
+def keep_only(user_id, path, report_type=None, content_hash=None, columns=None):
+    """
+    Register path as the workspace's current report and delete every other file the
+    manifest lists, replacing the old "more than one file" cleanup.
+
+    Args:
+        user_id: Workspace owner.
+        path: Dataset materialized in the workspace.
+        report_type: Registry key of the report.
+        content_hash: sha256 of the source workbook.
+        columns: Column names of the dataset.
+
+    Returns:
+        Report record stored in the manifest:
+        {
+            'report_type': Optional[str],
+            'file': str,
+            'path': str,
+            'hash': Optional[str],
+            'columns': List[str],
+            'recorded_at': float
+        }
+    """
+    directory = workspace_dir(user_id)
+    name = os.path.basename(path)
+    now = time.time()
+    report = {
+        'report_type': report_type,
+        'file': name,
+        'path': path,
+        'hash': content_hash,
+        'columns': list(columns or []),
+        'recorded_at': now
+    }
+    with _lock:
+        manifest = _read_manifest(directory)
+        for old_name in list(manifest["files"]):
+            if old_name != name:
+                try:
+                    os.remove(os.path.join(directory, old_name))
+                except FileNotFoundError:
+                    pass
+                del manifest["files"][old_name]
+        manifest["files"][name] = {"size": os.path.getsize(path), "added_at": now}
+        manifest["report"] = report
+        manifest["accessed_at"] = now
+        _write_manifest(directory, manifest)
+    return report
+
+
+def current_report(directory):
+    """
+    Report record of a workspace, as written by keep_only, or None.
+
+    The manifest is only ever replaced whole, so this is safe while another
+    worker sharing the volume updates it.
+    """
+    return _read_manifest(directory).get("report")
+
+
+def _workspace_size(directory):
+    """
+    Bytes removing the workspace would free.
+
+    Datasets hard-linked from report_store (st_nlink > 1) are not counted: their
+    space belongs to the store, which has its own cap.
+    """
+    total = 0
+    for root, _, files in os.walk(directory):
+        for file_name in files:
+            try:
+                stat = os.stat(os.path.join(root, file_name))
+            except OSError:
+                continue
+            if stat.st_nlink <= 1:
+                total += stat.st_size
+    return total
+
+
+def _accessed_at(directory):
+    accessed_at = _read_manifest(directory).get("accessed_at") or 0.0
+    if not accessed_at:
+        try:
+            accessed_at = os.path.getmtime(directory)
+        except OSError:
+            pass
+    return accessed_at
+
+
+def sweep(now=None):
+    """
+    Remove expired workspaces, then the least recently used ones while over quota.
+
+    Returns:
+        Dictionary {'removed': int, 'freed_bytes': int, 'total_bytes': int}
+    """
+    now = now or time.time()
+    result = {'removed': 0, 'freed_bytes': 0, 'total_bytes': 0}
+    if not os.path.isdir(UPLOAD_ROOT):
+        return result
+
+    workspaces = []
+    for entry in os.scandir(UPLOAD_ROOT):
+        if entry.is_dir():
+            workspaces.append((_accessed_at(entry.path), entry.path, _workspace_size(entry.path)))
+    workspaces.sort()
+    total = sum(size for _, _, size in workspaces)
+    quota = UPLOAD_QUOTA_MB * 1024 * 1024
+
+    for accessed_at, directory, size in workspaces:
+        idle = now - accessed_at
+        expired = idle > WORKSPACE_TTL_SECONDS
+        over_quota = total > quota and idle > ACTIVE_SECONDS
+        if not (expired or over_quota):
+            continue
+        # Workers sharing the volume may sweep the same directory
+        shutil.rmtree(directory, ignore_errors=True)
+        total -= size
+        result['removed'] += 1
+        result['freed_bytes'] += size
+    result['total_bytes'] = total
+    if result['removed']:
+        logger.info(f"Workspace sweep removed {result['removed']} workspaces "
+                    f"({result['freed_bytes'] / 1e6:.1f} MB), {total / 1e6:.1f} MB left")
+    return result
+
+
+def _sweep_forever():
+    while True:
+        try:
+            sweep()
+        except Exception as e:
+            logger.error(f"Workspace sweep failed: {e}")
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+
+
+def start_sweeper():
+    """Start the background sweeper once per process."""
+    global _sweeper
+    with _lock:
+        if _sweeper is None:
+            _sweeper = threading.Thread(target=_sweep_forever, name="workspace-sweeper", daemon=True)
+            _sweeper.start()
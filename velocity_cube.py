@@ -0,0 +1,110 @@
+import time
+import threading
+import pandas as pd
+import memory_governor
+import order_index
+
+# Units sold per customer per day, for the Sales Velocity charts.
+# Built once per report version from the line items; weekly and monthly views are
+# rolled up from the daily level and kept, so switching frequency is a lookup.
+# Frames that are not the full report (no report key, filtered) are computed directly.
+PERIOD = "Period"
+
+_lock = threading.Lock()
+_entries = {}   # (report_key, date_col, qty_col, customer_col) -> {'daily', 'index', 'views', 'bytes', 'last_access'}
+
+
+def _daily(data, date_col, qty_col, customer_col):
+    days = data[date_col].dt.floor('D')
+    lines = pd.DataFrame({customer_col: data[customer_col], PERIOD: days, qty_col: data[qty_col]})
+    lines = lines[days.notna()]
+    # Missing customers stay in the cube, they count towards the total
+    return lines.groupby([customer_col, PERIOD], observed=True, dropna=False)[qty_col].sum()
+
+
+def _period_labels(days, freq_alias):
+    """Label of the resample bin each day falls in (right-labelled, like resample)."""
+    if freq_alias == "D":
+        return days
+    if freq_alias == "W-SUN":
+        return days + pd.to_timedelta(6 - days.weekday, unit='D')
+    if freq_alias == "ME":
+        return days + pd.offsets.MonthEnd(0)
+    raise ValueError(f"Unsupported velocity frequency: {freq_alias}")
+
+
+def _roll_up(daily, freq_alias, qty_col, customer_col):
+    per_day = daily.groupby(level=PERIOD).sum()
+    total = per_day.resample(freq_alias).sum().reset_index()
+    total.rename(columns={qty_col: 'Total Units Sold'}, inplace=True)
+
+    stores = daily[daily.index.get_level_values(customer_col).notna()]
+    labels = _period_labels(stores.index.get_level_values(PERIOD), freq_alias)
+    store = stores.groupby([stores.index.get_level_values(customer_col), labels], observed=True).sum()
+    store.index.names = [customer_col, PERIOD]
+    store = store.reset_index()
+    store.rename(columns={qty_col: 'Units Sold'}, inplace=True)
+    return {'total': total, 'store': store}
+
+
+def _entry_for(data, date_col, qty_col, customer_col):
+    report_key = data.attrs.get(order_index.REPORT_KEY_ATTR)
+    if report_key is None:
+        return None
+    key = (report_key, date_col, qty_col, customer_col)
+    with _lock:
+        entry = _entries.get(key)
+    if entry is not None and not data.index.equals(entry['index']):
+        return None
+    if entry is None:
+        daily = _daily(data, date_col, qty_col, customer_col)
+        entry = {
+            'daily': daily,
+            'index': data.index,
+            'views': {},
+            'bytes': int(daily.memory_usage(index=True, deep=True)),
+            'last_access': time.time(),
+        }
+        with _lock:
+            _entries[key] = entry
+        memory_governor.enforce()
+    entry['last_access'] = time.time()
+    return entry
+
+
+def velocity(data, freq_alias, date_col='Date Created', qty_col='QTY', customer_col='Customer'):
+    """
+    Total and per-customer units sold per period.
+
+    Args:
+        data: Line-item frame, as the charts receive it.
+        freq_alias: "D", "W-SUN" or "ME".
+
+    Returns:
+        Dictionary {'total': DataFrame['Period', 'Total Units Sold'],
+                    'store': DataFrame[customer_col, 'Period', 'Units Sold']}
+    """
+    entry = _entry_for(data, date_col, qty_col, customer_col)
+    if entry is None:
+        return _roll_up(_daily(data, date_col, qty_col, customer_col), freq_alias, qty_col, customer_col)
+    view = entry['views'].get(freq_alias)
+    if view is None:
+        view = _roll_up(entry['daily'], freq_alias, qty_col, customer_col)
+        with _lock:
+            entry['views'][freq_alias] = view
+            entry['bytes'] += sum(int(frame.memory_usage(index=True, deep=True).sum()) for frame in view.values())
+    return {name: frame.copy(deep=False) for name, frame in view.items()}
+
+
+def _items():
+    with _lock:
+        return [{'key': key, 'bytes': entry['bytes'], 'last_access': entry['last_access'], 'sessions': []}
+                for key, entry in _entries.items()]
+
+
+def evict(key):
+    with _lock:
+        _entries.pop(key, None)
+
+
+memory_governor.register_pool("velocity_cube", _items, evict)
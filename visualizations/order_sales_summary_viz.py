@@ -1,51 +1,25 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import numpy as np
 import plotly.graph_objects as go
 import textwrap
-
-def preprocess_data(data):
-    """
-    Data preprocessing: data type conversion and cleaning.
-
-    Args:
-        data: A Pandas DataFrame with the source data.
-
-    Returns:
-        Pandas DataFrame with the processed data.
-    """
-
-    # Identify numeric columns automatically
-    numeric_cols = data.select_dtypes(include=np.number).columns
-
-    # Process numeric columns
-    for col in numeric_cols:
-        # Use .isna() instead of np.isnan() because it's safer for different data types
-        if data[col].isna().any():
-            # ASSIGN the result back to data[col] instead of using inplace=True
-            data[col] = data[col].fillna(0)
-            print(f"Warning: Column '{col}' contains missing values (NaN). Filled with 0.")
-
-    # Remove currency symbols and thousands separators
-    data[numeric_cols] = data[numeric_cols].replace('[$,]', '', regex=True).astype(float)
-
-    return data
+import order_index
+import velocity_cube
 
 #_________________Sales Trends Function  (with Plotly)_______________________________
 def visualize_sales_trends1(data, customer_col='Customer', product_col='Product Name', 
                             grand_total_col='Grand Total', qty_col='QTY', 
                             order_id_col='Order ID'):  # Add order_id_col parameter
     
-    # Convert Grand Total to numeric
-    data[grand_total_col] = pd.to_numeric(data[grand_total_col], errors='coerce')
-    data = data.dropna(subset=[grand_total_col])
+    # Step 1: One row per order (first occurrence per Order ID), built once per report
+    unique_orders = order_index.orders(data, order_id_col)
     
-    # Step 1: Remove duplicate orders (keep first occurrence per Order ID)
-    unique_orders = data.drop_duplicates(subset=[order_id_col])
+    # Convert Grand Total to numeric
+    unique_orders[grand_total_col] = pd.to_numeric(unique_orders[grand_total_col], errors='coerce')
+    unique_orders = unique_orders.dropna(subset=[grand_total_col])
     
     # Step 2: Calculate total sales per customer using de-duplicated data
-    customer_sales = unique_orders.groupby(customer_col)[grand_total_col].sum()
+    customer_sales = unique_orders.groupby(customer_col, observed=True)[grand_total_col].sum()
     top_customers = customer_sales.nlargest(10)
 
     # Create plot
@@ -69,13 +43,12 @@ def visualize_sales_trends2(data, customer_col='Customer', product_col='Product
                            grand_total_col='Grand Total', qty_col='QTY',
                            order_id_col='Order ID'):  # Add order_id_col parameter
     
-    # Convert date and Grand Total
-    data['Date Created'] = pd.to_datetime(data['Date Created'])
-    data[grand_total_col] = pd.to_numeric(data[grand_total_col], errors='coerce')
-    data = data.dropna(subset=[grand_total_col])
+    # Step 1: One row per order, built once per report
+    unique_orders = order_index.orders(data, order_id_col)
     
-    # Step 1: Remove duplicate orders
-    unique_orders = data.drop_duplicates(subset=[order_id_col])
+    # Convert Grand Total ('Date Created' is parsed at load time)
+    unique_orders[grand_total_col] = pd.to_numeric(unique_orders[grand_total_col], errors='coerce')
+    unique_orders = unique_orders.dropna(subset=[grand_total_col])
     
     # Step 2: Group de-duplicated data by month
     monthly_sales = unique_orders.groupby(pd.Grouper(key='Date Created', freq='ME'))[grand_total_col].sum()
@@ -109,7 +82,7 @@ def visualize_product_analysis1(data, product_col='Product Name',
     data = data.dropna(subset=[product_total_col])
     
     # Group by product using PRODUCT-level total (not order total)
-    product_data = data.groupby(product_col)[product_total_col].agg(['sum', 'count']).sort_values(by='sum', ascending=False)
+    product_data = data.groupby(product_col, observed=True)[product_total_col].agg(['sum', 'count']).sort_values(by='sum', ascending=False)
 
     # Calculate percentages
     total_sales_sum = product_data['sum'].sum()
@@ -149,7 +122,7 @@ def visualize_product_analysis2(data, product_col='Product Name'):
     """Distribution of orders by product (uses count of occurrences, not Grand total)"""
     
 
-    product_counts = data.groupby(product_col).size().sort_values(ascending=False)
+    product_counts = data.groupby(product_col, observed=True).size().sort_values(ascending=False)
     
     # 1. Get the full labels as strings
     full_labels = product_counts.index.astype(str).tolist()
@@ -204,7 +177,7 @@ def visualize_discount_analysis1(data, discount_type_col='Discount Type', total_
     data = data.dropna(subset=[total_discount_col])
 
     # Group by customer and sum the total discounts, then get the top 10 customers
-    top_customers_discount = data.groupby('Customer')[total_discount_col].sum().nlargest(10)
+    top_customers_discount = data.groupby('Customer', observed=True)[total_discount_col].sum().nlargest(10)
 
     # Check if there are no non-zero discounts
     if top_customers_discount.sum() == 0:
@@ -397,7 +370,7 @@ def visualize_combined_analysis2(data, product_col='Product Name',
 
     # 2. Group Data: We group by both Full Name and Short Name to keep them linked
     #    This ensures we have the correct counts for the bars.
-    counts = data.groupby([product_col, 'short_name', delivery_status_col]).size().reset_index(name='count')
+    counts = data.groupby([product_col, 'short_name', delivery_status_col], observed=True).size().reset_index(name='count')
 
     fig = go.Figure()
 
@@ -453,35 +426,14 @@ def get_freq_alias(label):
 
 # --- 1. Data Processing Functions (The "Logic") ---
 
-def calculate_total_velocity(data, freq_label, date_col='Date Created', qty_col='QTY'):
+def calculate_total_velocity(data, freq_label, date_col='Date Created', qty_col='QTY', customer_col='Customer'):
     """Calculates total units sold based on frequency."""
-    # Ensure date column is datetime
-    data[date_col] = pd.to_datetime(data[date_col])
-    freq_alias = get_freq_alias(freq_label)
-    
-    # Resample
-    velocity_data = data[[date_col, qty_col]].copy()
-    grouped_velocity = velocity_data.resample(freq_alias, on=date_col)[qty_col].sum().reset_index()
-    
-    # Rename for clarity
-    grouped_velocity.rename(columns={date_col: 'Period', qty_col: 'Total Units Sold'}, inplace=True)
-    
-    return grouped_velocity
+    # Rolled up from the cached daily cube, so switching frequency does not regroup the line items
+    return velocity_cube.velocity(data, get_freq_alias(freq_label), date_col, qty_col, customer_col)['total']
 
 def calculate_store_velocity(data, freq_label, date_col='Date Created', qty_col='QTY', customer_col='Customer'):
     """Calculates units sold per store based on frequency."""
-    data[date_col] = pd.to_datetime(data[date_col])
-    freq_alias = get_freq_alias(freq_label)
-    
-    # Group by Customer AND Time Frequency
-    store_velocity = data.groupby([
-        customer_col, 
-        pd.Grouper(key=date_col, freq=freq_alias)
-    ])[qty_col].sum().reset_index()
-    
-    store_velocity.rename(columns={date_col: 'Period', qty_col: 'Units Sold'}, inplace=True)
-    
-    return store_velocity
+    return velocity_cube.velocity(data, get_freq_alias(freq_label), date_col, qty_col, customer_col)['store']
 
 # --- 2. Visualization Functions ---
 
@@ -507,7 +459,7 @@ def visualize_total_velocity(df_total, freq_label):
 def visualize_store_velocity(df_store, freq_label, customer_col='Customer', qty_col='Units Sold'):
     """Visualizes the processed store velocity data."""
     # Identify Top 10 Stores for the view (based on total volume in the selected period)
-    top_stores_series = df_store.groupby(customer_col)[qty_col].sum()
+    top_stores_series = df_store.groupby(customer_col, observed=True)[qty_col].sum()
     top_stores = top_stores_series.nlargest(10).index.tolist()
     
     fig = px.line(
@@ -1,40 +1,11 @@
 import plotly.express as px
 import pandas as pd
 import streamlit as st
-import numpy as np
 from plotly.colors import sequential
 from plotly.colors import qualitative
 import plotly.graph_objects as go
 import plotly.colors as colors
 
-def preprocess_data(data):
-    """
-    Data preprocessing: data type conversion and cleaning.
-
-    Args:
-        data: A Pandas DataFrame with the source data.
-
-    Returns:
-        Pandas DataFrame with the processed data.
-    """
-
-    # Identify numeric columns automatically
-    numeric_cols = data.select_dtypes(include=np.number).columns
-
-    # Process numeric columns
-    for col in numeric_cols:
-        # Use .isna() instead of np.isnan() because it's safer for different data types
-        if data[col].isna().any():
-            # ASSIGN the result back to data[col] instead of using inplace=True
-            data[col] = data[col].fillna(0)
-            print(f"Warning: Column '{col}' contains missing values (NaN). Filled with 0.")
-
-    # Remove currency symbols and thousands separators
-    data[numeric_cols] = data[numeric_cols].replace('[$,]', '', regex=True).astype(float)
-
-    return data
-
-
 def Business_Payment_Insights(df):
     # 1. Data Cleaning: Group and sum the financial metrics
     # We take the top 15 businesses by total volume to keep the chart clean
@@ -112,9 +83,9 @@ def Payment_Distribution_Treemap(df):
     
     # 3. Aggregate for Hierarchy
     # Level 1: Status
-    status_agg = df_clean.groupby('Payment Status')['Payment Amount'].sum().reset_index()
+    status_agg = df_clean.groupby('Payment Status', observed=True)['Payment Amount'].sum().reset_index()
     # Level 2: Status + Method
-    method_agg = df_clean.groupby(['Payment Status', 'Payment Method Grouped'])['Payment Amount'].sum().reset_index()
+    method_agg = df_clean.groupby(['Payment Status', 'Payment Method Grouped'], observed=True)['Payment Amount'].sum().reset_index()
     
     # 4. Prepare Treemap Arrays
     ids, labels, parents, values = [], [], [], []
@@ -1,40 +1,11 @@
 import plotly.express as px
 import pandas as pd
 import streamlit as st
-import numpy as np
 from plotly.colors import sequential
 from plotly.colors import qualitative
 import plotly.graph_objects as go
 import plotly.colors as colors
 
-def preprocess_data(data):
-    """
-    Data preprocessing: data type conversion and cleaning.
-
-    Args:
-        data: A Pandas DataFrame with the source data.
-
-    Returns:
-        Pandas DataFrame with the processed data.
-    """
-
-    # Identify numeric columns automatically
-    numeric_cols = data.select_dtypes(include=np.number).columns
-
-    # Process numeric columns
-    for col in numeric_cols:
-        # Use .isna() instead of np.isnan() because it's safer for different data types
-        if data[col].isna().any():
-            # ASSIGN the result back to data[col] instead of using inplace=True
-            data[col] = data[col].fillna(0)
-            print(f"Warning: Column '{col}' contains missing values (NaN). Filled with 0.")
-
-    # Remove currency symbols and thousands separators
-    data[numeric_cols] = data[numeric_cols].replace('[$,]', '', regex=True).astype(float)
-
-    return data
-
-
 def Quantity_Delivered_Returned_Per_Rep_Visualization(df):
     """
     Creates a grouped bar chart of total quantity delivered and returned per sales representative.
@@ -122,9 +93,6 @@ def Quantity_Sold_Over_Time_Visualization(df):
     # Filter for delivered and fulfilled items
     df_filtered = df[(df["Type"] == "Delivery") & (df["Delivery Status"] == "FULFILLED")].copy()
 
-    # Convert Fulfill date to datetime (assuming MM/DD/YYYY format)
-    df_filtered["Fulfill Date"] = pd.to_datetime(df_filtered["Fulfill Date"], format='mixed', errors='coerce')
-
     # Extract month period for grouping
     df_filtered["Month"] = df_filtered["Fulfill Date"].dt.to_period("M")
 
@@ -1,49 +1,13 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
-import numpy as np
 import plotly.graph_objects as go
 
-def preprocess_data(data):
-    """
-    Data preprocessing: data type conversion and cleaning.
-
-    Args:
-        data: A Pandas DataFrame with the source data.
-
-    Returns:
-        Pandas DataFrame with the processed data.
-    """
-
-    # Identify numeric columns automatically
-    numeric_cols = data.select_dtypes(include=np.number).columns
-
-    # Process numeric columns
-    for col in numeric_cols:
-        # Use .isna() instead of np.isnan() because it's safer for different data types
-        if data[col].isna().any():
-            # ASSIGN the result back to data[col] instead of using inplace=True
-            data[col] = data[col].fillna(0)
-            print(f"Warning: Column '{col}' contains missing values (NaN). Filled with 0.")
-
-    # Remove currency symbols and thousands separators
-    data[numeric_cols] = data[numeric_cols].replace('[$,]', '', regex=True).astype(float)
-
-    return data
-
 def analyze_sales_rep_efficiency(df_pd):
     """Analyzes sales representative efficiency and displays a pie chart."""
 
     df_pd = df_pd.copy()
 
-    def convert_hours_to_numeric(time_str):
-        try:
-            hours, minutes = map(int, time_str.split('h '))
-            return hours + minutes / 60
-        except ValueError:
-            return pd.NA
-
-    df_pd['Total Working Hours'] = df_pd['Total Working Hours'].apply(convert_hours_to_numeric)
+    # 'Total Working Hours' is converted to hours by report_preprocess
     df_pd["Visits per Working Hour"] = df_pd["Total Visits"] / df_pd["Total Working Hours"]
     df_pd["Customers per Visit"] = df_pd["Assigned Customers"] / df_pd["Total Visits"]
 
@@ -145,24 +109,7 @@ def analyze_work_hours_and_distance1(df_pd):
     """
     df_pd = df_pd.copy()
 
-    def parse_time(time_str):
-        if pd.isna(time_str):
-            return 0
-        import re
-        match = re.match(r'(\d+)h\s*(\d+)m', time_str)
-        if match:
-            h, m = map(int, match.groups())
-        else:
-            match = re.match(r'(\d+)m', time_str)
-            if match:
-                m = int(match.group(1))
-                h = 0
-            else:
-                h, m = 0, 0
-        return h + m / 60
-
-    df_pd['Total Working Hours'] = df_pd['Total Working Hours'].apply(parse_time)
-    df_pd['Total Break Hours'] = df_pd['Total Break Hours'].apply(parse_time)
+    # Working and break hours are converted to hours by report_preprocess
     df_pd['Pure Work Hours'] = df_pd['Total Working Hours'] - df_pd['Total Break Hours']
     df_pd = df_pd.sort_values(by='Pure Work Hours', ascending=False).head(10)
 
@@ -197,24 +144,7 @@ def analyze_work_hours_and_distance2(df_pd):
     """
     df_pd = df_pd.copy()
 
-    def parse_time(time_str):
-        if pd.isna(time_str):
-            return 0
-        import re
-        match = re.match(r'(\d+)h\s*(\d+)m', time_str)
-        if match:
-            h, m = map(int, match.groups())
-        else:
-            match = re.match(r'(\d+)m', time_str)
-            if match:
-                m = int(match.group(1))
-                h = 0
-            else:
-                h, m = 0, 0
-        return h + m / 60
-
-    df_pd['Total Working Hours'] = df_pd['Total Working Hours'].apply(parse_time)
-    df_pd['Total Break Hours'] = df_pd['Total Break Hours'].apply(parse_time)
+    # Working and break hours are converted to hours by report_preprocess
     df_pd['Pure Work Hours'] = df_pd['Total Working Hours'] - df_pd['Total Break Hours']
     df_pd = df_pd.sort_values(by='Pure Work Hours', ascending=False).head(10)
 
@@ -1,37 +1,9 @@
 import pandas as pd
-import numpy as np
 import streamlit as st
 import plotly.express as px
 import calendar
 import plotly.graph_objects as go
 
-def preprocess_data(data):
-    """
-    Data preprocessing: data type conversion and cleaning.
-
-    Args:
-        data: A Pandas DataFrame with the source data.
-
-    Returns:
-        Pandas DataFrame with the processed data.
-    """
-
-    # Identify numeric columns automatically
-    numeric_cols = data.select_dtypes(include=np.number).columns
-
-    # Process numeric columns
-    for col in numeric_cols:
-        # Use .isna() instead of np.isnan() because it's safer for different data types
-        if data[col].isna().any():
-            # ASSIGN the result back to data[col] instead of using inplace=True
-            data[col] = data[col].fillna(0)
-            print(f"Warning: Column '{col}' contains missing values (NaN). Filled with 0.")
-
-    # Remove currency symbols and thousands separators
-    data[numeric_cols] = data[numeric_cols].replace('[$,]', '', regex=True).astype(float)
-
-    return data
-
 #Visualize the relationships between Orders/Cases Sold and Revenue
 def plot_sales_relationships1(df):
     # Preprocess the data
@@ -96,8 +68,7 @@ def plot_revenue_by_month_and_role(df):
     # Convert 'Total Revenue' to numeric, coercing non-numeric values to NaN
     df['Total Revenue'] = pd.to_numeric(df['Total Revenue'], errors='coerce')
     
-    # Convert 'Date' to datetime, coercing invalid dates to NaT
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    # 'Date' is parsed at load time, invalid dates are NaT
     df['Month'] = df['Date'].dt.month
     
     # Drop rows where 'Month' is NaN (invalid dates) or 'Role' is None
@@ -181,8 +152,8 @@ def plot_cases_sold_by_day_of_week(df):
     # Create a copy to avoid modifying the original DataFrame
     df = df.copy()
     
-    # Convert 'Date' to datetime, coercing errors to NaT
-    df['Day of Week'] = pd.to_datetime(df['Date'], errors='coerce').dt.dayofweek
+    # 'Date' is parsed at load time, invalid dates are NaT
+    df['Day of Week'] = df['Date'].dt.dayofweek
     
     # Drop rows where 'Day of Week' is NaN (invalid dates)
     df = df.dropna(subset=['Day of Week'])
@@ -233,9 +204,6 @@ def plot_revenue_trend_by_month_and_role(df):
     # Convert 'Total Revenue' to numeric, coercing errors to NaN
     df['Total Revenue'] = pd.to_numeric(df['Total Revenue'], errors='coerce')
     
-    # Convert 'Date' to datetime, coercing invalid dates to NaT
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-    
     # Extract month period (e.g., '2022-01') for grouping
     df['Month'] = df['Date'].dt.to_period('M')
 
@@ -470,9 +438,6 @@ def revenue_and_conversion_rate_comparison(df):
 def revenue_conversion_and_trend(df):
     data = df.copy()
 
-    # Ensuring 'Date' column is in datetime format
-    data['Date'] = pd.to_datetime(data['Date'])
-
     # Grouping the data by Name to calculate total revenue and conversion rate
     rep_data = data.groupby('Name').agg(
         total_revenue_direct=('Total Revenue (Direct)', 'sum'),
@@ -1,41 +1,10 @@
 import plotly.express as px
-import pandas as pd
 import streamlit as st
-import numpy as np
 from plotly.colors import sequential
 from plotly.colors import qualitative
 import plotly.graph_objects as go
 import plotly.colors as colors
 
-def preprocess_data(data):
-    """
-    Data preprocessing: data type conversion and cleaning.
-
-    Args:
-        data: A Pandas DataFrame with the source data.
-
-    Returns:
-        Pandas DataFrame with the processed data.
-    """
-
-    # Identify numeric columns automatically
-    numeric_cols = data.select_dtypes(include=np.number).columns
-
-    # Process numeric columns
-    for col in numeric_cols:
-        # Use .isna() instead of np.isnan() because it's safer for different data types
-        if data[col].isna().any():
-            # ASSIGN the result back to data[col] instead of using inplace=True
-            data[col] = data[col].fillna(0)
-            print(f"Warning: Column '{col}' contains missing values (NaN). Filled with 0.")
-
-    # Remove currency symbols and thousands separators
-    data[numeric_cols] = data[numeric_cols].replace('[$,]', '', regex=True).astype(float)
-
-    return data
-
-
-
 def Sales_Performance_Visualization(df):
     # Ensure required columns exist
     df['Business Name'] = df['Business Name'].apply(lambda x: x[:35] + '...' if len(x) > 35 else x)
@@ -116,10 +85,7 @@ def Sales_Trend_Visualization(df):
         st.error(f"The following required columns are missing from the dataset: {', '.join(missing_columns)}")
         return
     
-    # Ensure 'Date' is a datetime object
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-    
-    # Filter rows with valid dates
+    # 'Date' is parsed at load time; filter rows with valid dates
     filtered_data = df.dropna(subset=['Date'])
     
     # Aggregate data by Name and Date
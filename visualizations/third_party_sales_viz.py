@@ -1,8 +1,8 @@
 import pandas as pd
-import numpy as np
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
+import order_index
 
 # from utils import plotly_preproc
 
@@ -14,36 +14,9 @@ def plotly_preproc(fig):
     with tab2:
         st.plotly_chart(fig, theme=None, use_container_width=True)
 
-def preprocess_data(data):
-    """
-    Data preprocessing: data type conversion and cleaning.
-
-    Args:
-        data: A Pandas DataFrame with the source data.
-
-    Returns:
-        Pandas DataFrame with the processed data.
-    """
-
-    # Identify numeric columns automatically
-    numeric_cols = data.select_dtypes(include=np.number).columns
-
-    # Process numeric columns
-    for col in numeric_cols:
-        # Use .isna() instead of np.isnan() because it's safer for different data types
-        if data[col].isna().any():
-            # ASSIGN the result back to data[col] instead of using inplace=True
-            data[col] = data[col].fillna(0)
-            print(f"Warning: Column '{col}' contains missing values (NaN). Filled with 0.")
-
-    # Remove currency symbols and thousands separators
-    data[numeric_cols] = data[numeric_cols].replace('[$,]', '', regex=True).astype(float)
-
-    return data
-
 #Total sales
 def visualize_product_analysis1(data, product_col='Product Name', grand_total_col='Grand Total', threshold=0.02):
-    product_data = data.groupby(product_col)[grand_total_col].agg(['sum', 'count']).sort_values(by='sum', ascending=False)
+    product_data = data.groupby(product_col, observed=True)[grand_total_col].agg(['sum', 'count']).sort_values(by='sum', ascending=False)
     
     # Calculate percentages
     product_data['percentage'] = product_data['count'] / product_data['count'].sum()
@@ -75,8 +48,7 @@ def visualize_product_analysis1(data, product_col='Product Name', grand_total_co
 def visualize_product_analysis2(data, product_col='Product Name', order_id_col='Order ID'):
     """Distribution of unique orders by product"""
     # Count unique orders per product
-    unique_orders = data.drop_duplicates(subset=[order_id_col, product_col])
-    product_counts = unique_orders.groupby(product_col).size().sort_values(ascending=False)
+    product_counts = order_index.orders_per_item(data, product_col, order_id_col).sort_values(ascending=False)
     
     # Bar chart
     fig = go.Figure(data=[go.Bar(
@@ -102,14 +74,11 @@ def visualize_sales_trends(data, customer_col='Customer',
                           order_id_col='Order ID'):
     """Top customers by unique order totals"""
     # Get unique orders
-    unique_orders = data.drop_duplicates(subset=[order_id_col])
-    
-    # Convert to numeric
-    unique_orders = data.drop_duplicates(subset=[order_id_col, grand_total_col]).copy()
+    unique_orders = order_index.orders(data, order_id_col)
     unique_orders = unique_orders.dropna(subset=[grand_total_col])
     
     # Calculate top customers
-    top_customers = unique_orders.groupby(customer_col)[grand_total_col].sum().nlargest(10)
+    top_customers = unique_orders.groupby(customer_col, observed=True)[grand_total_col].sum().nlargest(10)
 
     # Create bar chart
     fig = go.Figure(data=[go.Bar(
@@ -145,11 +114,11 @@ def visualize_combined_analysis(data, product_col='Product Name',
     unique_orders = unique_orders.dropna(subset=[qty_col])
     
     # 3. Group data by product and quantity
-    grouped_data = unique_orders.groupby([product_col, qty_col]).size().reset_index(name='count')
+    grouped_data = unique_orders.groupby([product_col, qty_col], observed=True).size().reset_index(name='count')
     
     # --- LOGIC FIX: Sort by Popularity ---
     # Calculate total orders per product to find the REAL Top 15
-    product_popularity = grouped_data.groupby(product_col)['count'].sum()
+    product_popularity = grouped_data.groupby(product_col, observed=True)['count'].sum()
     top_15_products = product_popularity.sort_values(ascending=False).head(15).index.tolist()
     
     # Filter the data to only include these top 15 products